@@ -1,21 +1,57 @@
 #!/usr/bin/env python3
 
+import os
 import re
-from datetime import datetime
+import gzip
+import json
+import time
+import random
+import hashlib
+import threading
+from datetime import datetime, timezone
 
-from flask import Flask, jsonify, render_template
+import cachetools
+from flask import Flask, abort, g, jsonify, render_template, request
 from werkzeug.routing import BaseConverter, ValidationError
 
+try:
+    import brotli  # optional, for compressing responses with Brotli
+except ImportError:
+    brotli = None
+try:
+    import msgpack  # optional, for the MessagePack response format
+except ImportError:
+    msgpack = None
+
 try:  # when used as a module, do relative import
     from . import course_info
+    from . import metrics
     from . import scheduler
+    from . import solver_pool
+    from . import term_index
+    from .uwapi import single_flight
 except SystemError:  # not being used as a module, do normal import
     import course_info
+    import metrics
     import scheduler
+    import solver_pool
+    import term_index
+    from uwapi import single_flight
 
 # set up application
 app = Flask(__name__, static_url_path="/static")
 
+# cache of `/schedules` responses, keyed by term and course list, evicting the least recently used responses once the bodies (in every encoding) total 64 MiB
+schedules_cache = cachetools.LRUCache(maxsize=64 * 1024 * 1024, getsizeof=lambda entry: sum(len(body) for body in entry[0].values()))
+schedules_cache_lock = threading.Lock()
+
+PAGE_SIZE = 500  # number of schedules in each page of results, unless the client asks for fewer
+RESPONSE_FORMATS = {"json": "application/json", "compact": "application/json", "msgpack": "application/x-msgpack"}  # mapping from `/schedules` response formats to their content types
+MIN_COMPRESSED_SIZE = 1024  # bytes a response body needs to have before it's worth compressing
+
+SLOW_REQUEST_TIME = float(os.environ.get("COURSERATOR_SLOW_REQUEST_TIME", 1))  # seconds a request can take before it counts as slow
+SLOW_REQUEST_SAMPLE_RATE = float(os.environ.get("COURSERATOR_SLOW_REQUEST_SAMPLE_RATE", 0))  # fraction of slow requests to log along with their stage timings, or 0 to log none of them
+
 
 class TermConverter(BaseConverter):
     def to_python(self, value):
@@ -35,13 +71,37 @@ class CourseListConverter(BaseConverter):
         result = [course.strip() for course in value.split(",")]
         for course in result:
             if not re.match("^([a-zA-Z]+)\s*(\d\w*)$", course): raise ValidationError()
-        return result
+        return [re.sub("\s+", "", course).upper() for course in result]  # normalize course names like "cs 240" into "CS240"
 
     def to_url(self, values):
         return ",".join(BaseConverter.to_url(value) for value in values)
 app.url_map.converters["courselist"] = CourseListConverter
 
 
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    metrics.start_request()
+
+
+@app.after_request
+def record_request_metrics(response):
+    duration = time.perf_counter() - g.request_start
+    stages = metrics.finish_request()
+    endpoint = request.endpoint or "none"
+    metrics.increment("courserator_requests_total", endpoint=endpoint, status=response.status_code)
+    metrics.observe("courserator_request_seconds", duration, endpoint=endpoint)
+    if duration >= SLOW_REQUEST_TIME and random.random() < SLOW_REQUEST_SAMPLE_RATE:
+        stage_timings = ", ".join("{} {:.3f}s".format(stage, stage_duration) for stage, stage_duration in sorted(stages.items()))
+        app.logger.warning("slow request: %s took %.3fs (%s)", request.full_path.rstrip("?"), duration, stage_timings or "no stages")
+    return response
+
+
+@app.route("/metrics")
+def get_metrics():
+    return app.response_class(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.route("/")
 def index():
     term_to_select, terms = course_info.get_term_names()
@@ -50,22 +110,144 @@ def index():
 
 @app.route("/schedules/<term:term>/<courselist:courses>")
 def get_schedules(term, courses):
+    courses = sorted(set(courses))  # the same set of courses always results in the same response, regardless of order
     if len(courses) > 10:
         return jsonify(
             sections={},
             schedules=[],
             schedule_stats=[],
+            failed_courses={},
+            next_cursor=None,
+            partial=False,
         )
 
-    term_start, term_end = course_info.get_term_start_end_dates(term)
-    courses_data = course_info.get_courses_data(term, courses)
+    # schedules are returned in pages, where the cursor is the number of schedules in the previous pages
+    cursor = max(request.args.get("cursor", 0, type=int), 0)
+    limit = min(max(request.args.get("limit", PAGE_SIZE, type=int), 1), PAGE_SIZE)
+
+    # if ranking is requested, schedules are returned best first according to the preferences
+    preferences = None
+    if "rank" in request.args:
+        earliest = None
+        if request.args.get("earliest"):
+            match = re.match(r"^(\d\d?):(\d\d)$", request.args["earliest"])
+            if not match: abort(400)
+            earliest = int(match.group(1)) * 60 + int(match.group(2))
+        instructors = tuple(sorted(instructor.strip() for instructor in request.args.get("instructors", "").split(";") if instructor.strip()))  # instructor names contain commas, so they're separated by semicolons
+        preferences = scheduler.RankOptions(earliest, instructors)
+
+    # schedules can be filtered and sorted by their stats, so that clients only get the schedules they'll show (see `scheduler.ScheduleQuery`)
+    limits = {}
+    for name in ("max_days", "max_gaps", "min_headroom"):
+        value = request.args.get(name)
+        if value and not re.match(r"^-?\d+$", value): abort(400)
+        limits[name] = int(value) if value else None
+    query = scheduler.QueryOptions(sort=request.args.get("sort") or None, **limits)
+    if query.sort is not None and query.sort not in scheduler.SORT_KEYS: abort(400)
+    if query == scheduler.QueryOptions(None, None, None, None): query = None
+
+    # the "compact" and "msgpack" formats number each section once and send weekly meeting patterns instead of every meeting (see `get_schedules_body`)
+    response_format = request.args.get("format", "json")
+    if response_format not in RESPONSE_FORMATS or (response_format == "msgpack" and msgpack is None): abort(400)
+
+    # look for a cached response that was computed from the current API data
+    key = (term, tuple(courses), cursor, limit, preferences, query, response_format)
+    data_updated = get_data_updated(term, courses)
+    with schedules_cache_lock:
+        entry = schedules_cache.get(key)
+    is_cached = entry is not None and data_updated is not None and entry[2] == data_updated
+    metrics.increment("courserator_schedules_cache_total", result="hit" if is_cached else "miss")
+    if not is_cached:
+        body, failed_courses, complete = single_flight(repr(("schedules",) + key), lambda: compute_schedules_body(term, courses, cursor, limit, preferences, query, response_format))  # concurrent identical requests share one computation
+        entry = (get_encoded_bodies(body), hashlib.sha1(body).hexdigest(), get_data_updated(term, courses))
+        if not failed_courses and complete and entry[2] is not None and schedules_cache.getsizeof(entry) <= schedules_cache.maxsize:  # don't cache failures or partial results, since they're likely temporary
+            with schedules_cache_lock:
+                schedules_cache[key] = entry
+    bodies, etag, data_updated = entry
+
+    # send the body compressed if the client supports it
+    encoding = next((encoding for encoding in ("br", "gzip") if encoding in bodies and request.accept_encodings[encoding]), "identity")
+    response = app.response_class(bodies[encoding], content_type=RESPONSE_FORMATS[response_format])
+    response.vary.add("Accept-Encoding")
+    if encoding != "identity":
+        response.content_encoding = encoding
+        etag += "-" + encoding  # each encoding is a different representation, so it needs its own ETag
+
+    # browsers can keep the response, but have to revalidate it with the ETag or modification date each time
+    response.set_etag(etag)
+    if data_updated is not None:
+        response.last_modified = datetime.fromtimestamp(data_updated, timezone.utc)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def get_encoded_bodies(body):
+    """Returns a dictionary mapping content encodings to the response body `body` compressed with them, including "identity" for the uncompressed body."""
+    bodies = {"identity": body}
+    if len(body) >= MIN_COMPRESSED_SIZE:
+        bodies["gzip"] = gzip.compress(body)
+        if brotli is not None: bodies["br"] = brotli.compress(body)
+    return bodies
+
+
+def get_data_updated(term, courses):
+    """Returns the time the data for the given term and courses was last updated (in seconds since the epoch), or None if it isn't available."""
+    index = term_index.open_term_index(term)
+    return index.updated if index is not None else course_info.get_data_updated(term, courses)
+
+
+def compute_schedules_body(term, courses, cursor, limit, preferences=None, query=None, response_format="json"):
+    """
+    Returns a 3-tuple containing the response body for a page of up to `limit` schedules after the first `cursor` (see `get_schedules_body`), a dictionary mapping courses that couldn't be fetched to error messages, and whether the search finished in time.
+
+    `preferences` and `query` are optional `scheduler.RankOptions` and `scheduler.QueryOptions` for ranking and filtering schedules.
+    """
+    with metrics.timed("fetch"):
+        index = term_index.open_term_index(term)
+        if index is not None:  # the whole term was indexed ahead of time, so nothing needs to be fetched or parsed
+            courses_data, failed_courses = index.get_courses_data(courses)
+        else:
+            term_dates = course_info.executor.submit(course_info.get_term_start_end_dates, term)  # fetch the term dates while the courses are being fetched
+            courses_data, failed_courses = course_info.get_courses_data(term, courses)
+            term_start, term_end = term_dates.result()
     # from test_data import courses_data
 
-    course_sections = course_info.get_courses_sections(courses_data, term_start, term_end)
-    schedules = scheduler.compute_schedules(course_sections)
+    with metrics.timed("sections"):
+        course_sections = index.get_courses_sections(courses_data) if index is not None else course_info.get_courses_sections(courses_data, term_start, term_end)
+    if not course_sections:  # no course data was fetched, so there's nothing to schedule (the solver would find one empty schedule)
+        return get_schedules_body(courses_data, course_sections, [], failed_courses, None, False, response_format), failed_courses, True
+
+    schedule_query = schedule_filter = None
+    if query is not None:
+        stats = scheduler.ScheduleStats(course_sections, course_info.get_section_instructors(courses_data), course_info.get_section_headroom(courses_data))
+        schedule_query = scheduler.ScheduleQuery(stats, query.max_days, query.max_gaps, query.min_headroom, query.sort)
+        schedule_filter = schedule_query.accepts
 
+    deadline = time.time() + solver_pool.SOLVE_TIME_LIMIT
+    if preferences is not None or (schedule_query is not None and schedule_query.sort is not None):  # find the best schedules up to the end of the page, plus one more to check whether there's another page
+        if schedule_query is not None and schedule_query.sort is not None:
+            schedule_preferences = schedule_query
+        else:
+            schedule_preferences = scheduler.SchedulePreferences(course_sections, course_info.get_section_instructors(courses_data), preferences.earliest, preferences.instructors)
+        schedules, complete = solver_pool.run(solver_pool.rank_schedules, (term, course_sections, schedule_preferences, cursor + limit + 1, deadline, schedule_filter), deadline, ([], False))
+        schedules = schedules[cursor:]
+        next_cursor = cursor + limit if len(schedules) > limit else None
+        schedules = schedules[:limit]
+    else:  # continue enumerating schedules from where the previous page left off if possible, otherwise start over and skip to the cursor
+        iterator_key = (term, tuple(courses), get_data_updated(term, courses), query)
+        schedules, next_cursor, complete = solver_pool.run(solver_pool.find_schedules, (term, iterator_key, course_sections, cursor, limit, deadline, schedule_filter), deadline, ([], None, False))
+
+    with metrics.timed("serialize"):
+        return get_schedules_body(courses_data, course_sections, schedules, failed_courses, next_cursor, not complete, response_format), failed_courses, complete
+
+
+def get_schedules_body(courses_data, course_sections, schedules, failed_courses, next_cursor, partial=False, response_format="json"):
+    """
+    Returns the response body for the schedules `schedules` (lists of sections) as bytes in the format `response_format` (one of `RESPONSE_FORMATS`), given the courses data and course sections map they were computed from. `partial` indicates that the search for schedules was cut short.
+    """
     sections = {section for schedule in schedules for section in schedule}  # set of every section in every schedule
     section_entries = course_info.get_section_entries(courses_data, sections)
+    schedule_stats = scheduler.ScheduleStats({section: course_sections[section] for section in sections}, course_info.get_section_instructors(courses_data), course_info.get_section_headroom(courses_data)).get_stats(schedules)
 
     # compute section info
     json_sections_info = {}
@@ -74,12 +256,8 @@ def get_schedules(term, courses):
         # wip: keep track of locations
         for class_entry in section_entry["classes"]:
             instructors.update(class_entry["instructors"])
-        try:
-            earliest = min(start.time() for start, end in course_sections[section]).strftime("%H:%M")
-            latest = max(end.time() for start, end in course_sections[section]).strftime("%H:%M")
-        except ValueError:
-            earliest, latest = None, None
-        json_sections_info[section[0] + "|" + section[1]] = {
+        section_times = course_sections[section]
+        json_sections_info[section] = {
             "name": section_entry["subject"] + section_entry["catalog_number"],
             "section": section_entry["section"],
             "instructors": list(instructors),
@@ -89,37 +267,51 @@ def get_schedules(term, courses):
             "campus": section_entry["campus"],
             "note": section_entry["note"],
             "class_number": section_entry["class_number"],
-            "blocks": [(start.isoformat(), end.isoformat()) for start, end in course_sections[section]],
-            "earliest": earliest,
-            "latest": latest,
+            "earliest": section_times.earliest(),
+            "latest": section_times.latest(),
         }
+        if response_format == "json":
+            json_sections_info[section]["blocks"] = [(start.isoformat(), end.isoformat()) for start, end in section_times]
+        elif section_times.patterns is not None:
+            json_sections_info[section]["patterns"] = [(weekday, start_minute, end_minute, start_date.date().isoformat(), end_date.date().isoformat()) for weekday, start_minute, end_minute, start_date, end_date in section_times.patterns]
+        else:
+            json_sections_info[section]["patterns"] = None
+            json_sections_info[section]["blocks"] = list(zip(section_times.starts, section_times.ends))
+
+    if response_format != "json":  # number every section, and refer to them by number in the schedules
+        section_list = sorted(json_sections_info)
+        section_numbers = {section: index for index, section in enumerate(section_list)}
+        result = {
+            "format": "compact",
+            "sections": [json_sections_info[section] for section in section_list],
+            "schedules": [[section_numbers[section] for section in schedule] for schedule in schedules],
+            "schedule_stats": {name: schedule_stats[name] for name in ("days", "gaps", "headroom")},
+            "failed_courses": failed_courses,
+            "next_cursor": next_cursor,
+            "partial": partial,
+        }
+        if response_format == "msgpack": return msgpack.packb(result)
+        return json.dumps(result, separators=(",", ":")).encode("utf-8")
 
     # compute schedule info
+    json_sections_info = {section[0] + "|" + section[1]: section_info for section, section_info in json_sections_info.items()}
     json_schedules = [[section[0] + "|" + section[1] for section in schedule] for schedule in schedules]
 
-    # compute schedule stats
-    json_stats = []
-    for schedule in json_schedules:
-        earliest, latest = None, None
-        instructors = set()
-        for section_identifier in schedule:
-            section = json_sections_info[section_identifier]
-            instructors.update(section["instructors"])
-            if section["earliest"] is not None and (earliest is None or section["earliest"] < earliest):
-                earliest = section["earliest"]
-            if section["latest"] is not None and (latest is None or section["latest"] > latest):
-                latest = section["latest"]
-        json_stats.append({
-            "earliest": "-" if earliest is None else earliest,
-            "latest": "-" if latest is None else latest,
-            "instructors": sorted(instructors),
-        })
-
-    return jsonify(
+    # turn the schedule stats columns into one entry for each schedule
+    json_stats = [
+        {name: "-" if value is None else value for name, value in zip(schedule_stats, values)}
+        for values in zip(*schedule_stats.values())
+    ]
+
+    body = jsonify(
         sections=json_sections_info,
         schedules=json_schedules,
         schedule_stats=json_stats,
-    )
+        failed_courses=failed_courses,
+        next_cursor=next_cursor,
+        partial=partial,
+    ).get_data()
+    return body
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import io
+import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import HTTPException
+
+try:  # when used as a module, do relative import
+    from . import app
+except SystemError:  # not being used as a module, do normal import
+    from __init__ import app
+
+ASGI_THREADS = 32 # maximum number of requests the Flask app handles at once, the rest wait without blocking the event loop
+COALESCED_ENDPOINTS = {"index", "get_schedules"} # endpoints where concurrent identical requests share one response
+
+executor = ThreadPoolExecutor(max_workers=ASGI_THREADS) # runs the Flask app, which blocks while fetching from the API
+in_flight = {} # mapping from request keys to futures for responses currently being computed, only used from the event loop thread
+
+def get_environ(scope, body):
+    """Returns a WSGI environment for the ASGI HTTP connection scope `scope` with the request body `body`."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"), # WSGI strings are bytes decoded as Latin-1
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": "HTTP/" + scope.get("http_version", "1.1"),
+        "REMOTE_ADDR": client[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope["headers"]:
+        name, value = name.decode("latin-1").upper().replace("-", "_"), value.decode("latin-1")
+        key = name if name in ("CONTENT_TYPE", "CONTENT_LENGTH") else "HTTP_" + name
+        environ[key] = environ[key] + "," + value if key in environ else value
+    return environ
+
+def call_app(environ):
+    """Calls the Flask app with the WSGI environment `environ`, returning a 3-tuple containing the response status code, headers, and body."""
+    response = {}
+    def start_response(status, headers, exc_info=None):
+        response["status"], response["headers"] = status, headers
+    result = app(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        if hasattr(result, "close"): result.close()
+    headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in response["headers"]]
+    return int(response["status"].split(" ", 1)[0]), headers, body
+
+def get_coalescing_key(environ):
+    """Returns a key that is the same for requests that get the same response, or None if the request shouldn't share a response with other requests."""
+    if environ["REQUEST_METHOD"] not in ("GET", "HEAD"): return None
+    try:
+        endpoint, view_args = app.url_map.bind_to_environ(environ).match()
+    except HTTPException: # not found, redirects, etc.
+        return None
+    if endpoint not in COALESCED_ENDPOINTS: return None
+    return (environ["REQUEST_METHOD"], environ["PATH_INFO"], environ["QUERY_STRING"]) + tuple(environ.get(header) for header in ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE", "HTTP_ACCEPT_ENCODING"))
+
+async def get_response(environ):
+    """Returns the response for the WSGI environment `environ` like `call_app`, without blocking the event loop. Concurrent identical requests for coalesced endpoints share a single call to the Flask app."""
+    loop = asyncio.get_running_loop()
+    key = get_coalescing_key(environ)
+    if key is None: return await loop.run_in_executor(executor, call_app, environ)
+    future = in_flight.get(key)
+    if future is None:
+        future = in_flight[key] = loop.run_in_executor(executor, call_app, environ)
+        future.add_done_callback(lambda future: in_flight.pop(key, None))
+    return await asyncio.shield(future) # if this client disconnects, the other clients waiting for the same response still get it
+
+async def application(scope, receive, send):
+    """ASGI application that serves the Flask app, for use with ASGI servers like Uvicorn."""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http": return
+
+    # read the whole request body
+    body, more_body = b"", True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect": return
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+    status, headers, response_body = await get_response(get_environ(scope, body))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": response_body})
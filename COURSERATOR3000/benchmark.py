@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+import re
+import random
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+import contextlib
+import itertools
+from datetime import datetime
+
+try:  # when used as a module, do relative import
+    from . import app, get_schedules_body
+    from . import course_info
+    from . import scheduler
+    from . import test_data
+except SystemError:  # not being used as a module, do normal import
+    from __init__ import app, get_schedules_body
+    import course_info
+    import scheduler
+    import test_data
+
+TERM_START, TERM_END = datetime(2015, 1, 5), datetime(2015, 4, 6) # lecture dates of the term in `test_data`
+
+def build_synthetic_scheduler(encoding, requirement_count, section_count, slot_size, symmetry_breaking, seed=0):
+    """
+    Returns a `Scheduler` for `requirement_count` synthetic requirements with `section_count` sections each.
+
+    Sections in each requirement are split into time slots of `slot_size` sections with identical meeting times, and about a tenth of the pairs of time slots in different requirements conflict. If `symmetry_breaking` is True, sections in the same time slot are marked as interchangeable.
+    """
+    rng = random.Random(seed)
+    slots = {}
+    for requirement in range(requirement_count):
+        for section in range(section_count):
+            slots.setdefault((requirement, section // slot_size), []).append(("COURSE{}".format(requirement), "LEC {:03}".format(section)))
+    s = scheduler.Scheduler(encoding)
+    for requirement in range(requirement_count):
+        s.add_requirement("COURSE{}".format(requirement), ["LEC {:03}".format(section) for section in range(section_count)])
+    for (slot1, sections1), (slot2, sections2) in ((a, b) for a in slots.items() for b in slots.items() if a[0][0] < b[0][0]):
+        if rng.random() < 0.1:
+            for section1 in sections1:
+                for section2 in sections2:
+                    s.add_conflict(section1, section2)
+    if symmetry_breaking:
+        for sections in slots.values():
+            s.add_equivalent_sections(sections)
+    return s
+
+def benchmark_encodings(requirement_count=4, section_counts=(5, 10, 20, 40, 80), slot_size=4, limit=500):
+    """Prints the number of clauses and the time taken to find the first `limit` schedules for each CNF encoding, with and without symmetry breaking."""
+    print("{:>8} {:>10} {:>9} {:>8} {:>10} {:>10}".format("sections", "encoding", "symmetry", "clauses", "schedules", "time (ms)"))
+    for section_count in section_counts:
+        for encoding in scheduler.ENCODINGS:
+            for symmetry_breaking in (False, True):
+                s = build_synthetic_scheduler(encoding, requirement_count, section_count, slot_size, symmetry_breaking)
+                start = time.perf_counter()
+                schedule_count = sum(1 for index, schedule in zip(range(limit), s.solve()))
+                duration = time.perf_counter() - start
+                print("{:>8} {:>10} {:>9} {:>8} {:>10} {:>10.2f}".format(section_count, encoding, "yes" if symmetry_breaking else "no", len(s.constraints), schedule_count, duration * 1000))
+
+def time_call(function, repeat):
+    """Calls `function` `repeat` times, returning a 2-tuple containing the result of the last call and the median time taken by each call (in milliseconds)."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(durations)
+
+def benchmark_pipeline(course_counts=(1, 2, 4, 6, 8, 10), section_count=50, limit=500, repeat=5):
+    """
+    Prints the median time taken by each stage of computing a page of `limit` schedules, for synthetic courses with `section_count` sections each (see `test_data.get_synthetic_courses_data`), and the peak memory allocated while running every stage once.
+
+    The stages are computing the course sections map, detecting conflicts, building the CNF constraints (with the conflicts already cached), enumerating schedules with Pycosat, and building the JSON response body. The time taken to build the response body in the compact format and its size are shown for comparison.
+    """
+    print("{:>7} {:>8} {:>11} {:>11} {:>8} {:>10} {:>8} {:>10} {:>10} {:>10} {:>8} {:>10} {:>10}".format("courses", "sections", "times (ms)", "conflicts", "cnf", "solve", "json", "total", "schedules", "peak (KiB)", "compact", "json (B)", "compact (B)"))
+    for course_count in course_counts:
+        courses_data = test_data.get_synthetic_courses_data(course_count, section_count)
+
+        def get_course_sections(): return course_info.get_courses_sections(courses_data, TERM_START, TERM_END)
+        def get_conflicts(): return scheduler.get_conflicts(scheduler.get_requirements(course_sections), course_sections)
+        def build_scheduler(): return scheduler.build_scheduler(course_sections)
+        def solve(): return list(itertools.islice(s.solve(), limit))
+        def get_body():
+            with app.app_context(): return get_schedules_body(courses_data, course_sections, schedules, {}, None)
+        def get_compact_body(): return get_schedules_body(courses_data, course_sections, schedules, {}, None, response_format="compact")
+
+        course_sections, sections_time = time_call(get_course_sections, repeat)
+        conflicts, conflicts_time = time_call(get_conflicts, repeat)
+        s, build_time = time_call(build_scheduler, repeat)
+        schedules, solve_time = time_call(solve, repeat)
+        body, body_time = time_call(get_body, repeat)
+        compact_body, compact_body_time = time_call(get_compact_body, repeat)
+
+        # measure memory separately, since tracing allocations slows everything down
+        scheduler.conflicts_cache.clear()
+        tracemalloc.start()
+        course_sections = get_course_sections()
+        get_conflicts()
+        s = build_scheduler()
+        schedules = solve()
+        get_body()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        total_time = sections_time + conflicts_time + build_time + solve_time + body_time
+        print("{:>7} {:>8} {:>11.2f} {:>11.2f} {:>8.2f} {:>10.2f} {:>8.2f} {:>10.2f} {:>10} {:>10} {:>8.2f} {:>10} {:>10}".format(course_count, section_count, sections_time, conflicts_time, build_time, solve_time, body_time, total_time, len(schedules), peak_memory // 1024, compact_body_time, len(body), len(compact_body)))
+
+class StubAPI:
+    """Stand-in for `uwapi.uwapi` and `uwapi.uwapi_updated` that serves the fixture data `courses_data` (like `test_data.courses_data`), waiting `latency` seconds per request to simulate the API."""
+    def __init__(self, courses_data, latency=0):
+        self.courses_data = courses_data
+        self.latency = latency
+        self.updated = time.time()
+
+    def uwapi(self, endpoint, **params):
+        if self.latency: time.sleep(self.latency)
+        if re.match(r"^terms/\d+/importantdates$", endpoint): return test_data.important_dates
+        match = re.match(r"^terms/\d+/(\w+?)/(\d\w*)/schedule$", endpoint)
+        assert match is not None and match.group(1) + match.group(2) in self.courses_data, "HTTP error 404"
+        return self.courses_data[match.group(1) + match.group(2)]
+
+    def uwapi_updated(self, endpoint, **params):
+        return self.updated
+
+@contextlib.contextmanager
+def stub_api(stub):
+    """Context manager that makes `course_info` use the `StubAPI` instance `stub` instead of the API."""
+    original = course_info.uwapi, course_info.uwapi_updated
+    course_info.uwapi, course_info.uwapi_updated = stub.uwapi, stub.uwapi_updated
+    try:
+        yield
+    finally:
+        course_info.uwapi, course_info.uwapi_updated = original
+
+def percentile(values, percent):
+    """Returns the `percent`-th percentile of the sorted list `values`, using the nearest-rank method."""
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+def load_test(request_count=500, concurrency=8, latency=0, seed=0):
+    """
+    Prints the latency percentiles, throughput, and peak memory usage of the Flask app while `concurrency` threads make `request_count` requests for schedules in total.
+
+    Each request is for a random combination of 2 to 6 courses out of the recorded courses and a set of synthetic courses, a quarter of them ranked. The API is replaced by a `StubAPI` instance with the given `latency`, and responses are cached as usual, so repeated combinations are served from the cache.
+    """
+    courses_data = dict(test_data.courses_data, **test_data.get_synthetic_courses_data(10, 20, seed))
+    rng = random.Random(seed)
+    urls = []
+    for _ in range(request_count):
+        courses = rng.sample(sorted(courses_data), rng.randint(2, 6))
+        urls.append("/schedules/1151/{}{}".format(",".join(courses), "?rank&earliest=10:00" if rng.random() < 0.25 else ""))
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    pending = iter(urls)
+    def worker():
+        client = app.test_client()
+        while True:
+            with lock: url = next(pending, None)
+            if url is None: return
+            start = time.perf_counter()
+            response = client.get(url)
+            duration = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(duration)
+                if response.status_code != 200: errors.append((url, response.status_code))
+
+    with stub_api(StubAPI(courses_data, latency)):
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        duration = time.perf_counter() - start
+
+    latencies.sort()
+    print("requests: {}, concurrency: {}, errors: {}, throughput: {:.1f} requests/s".format(len(latencies), concurrency, len(errors), len(latencies) / duration))
+    print("latency (ms): p50 {:.2f}, p99 {:.2f}, max {:.2f}".format(percentile(latencies, 50), percentile(latencies, 99), latencies[-1]))
+    print("peak memory (KiB): {}".format(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)) # kibibytes on Linux
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the schedule pipeline.")
+    parser.add_argument("benchmark", nargs="?", choices=("encodings", "pipeline", "load", "all"), default="all", help="which benchmark to run (default: all)")
+    parser.add_argument("--requests", type=int, default=500, help="number of requests to make in the load test")
+    parser.add_argument("--concurrency", type=int, default=8, help="number of concurrent clients in the load test")
+    parser.add_argument("--latency", type=float, default=0, help="seconds the stubbed API waits per request in the load test")
+    args = parser.parse_args()
+
+    if args.benchmark in ("encodings", "all"): benchmark_encodings()
+    if args.benchmark in ("pipeline", "all"): benchmark_pipeline()
+    if args.benchmark in ("load", "all"): load_test(args.requests, args.concurrency, args.latency)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import json
+import sqlite3
+import threading
+import time
+
+import cachetools
+
+class MemoryCache:
+    """
+    Cache backend that stores entries in memory. Entries are only visible to the current process.
+
+    Every cache backend maps string keys to JSON-serializable values, along with the time each value was last updated. Backends also keep track of which entries are currently being refreshed, so that only one refresh happens at a time.
+    """
+    def __init__(self, maxsize=500):
+        self.entries = cachetools.LRUCache(maxsize=maxsize) # max `maxsize` items, least recently used items are evicted first
+        self.refreshing = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Returns a 2-tuple containing the value for `key` and the time it was last updated (in seconds since the epoch), or None if there is no value for `key`."""
+        with self.lock:
+            return self.entries.get(key)
+
+    def updated(self, key):
+        """Returns the time the value for `key` was last updated (in seconds since the epoch), or None if there is no value for `key`."""
+        entry = self.get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key, value, updated):
+        """Sets the value for `key` to `value`, last updated at `updated` (in seconds since the epoch)."""
+        with self.lock:
+            self.entries[key] = (value, updated)
+
+    def acquire_refresh(self, key, timeout):
+        """Produces True if the caller may refresh the value for `key`, and False if it is already being refreshed. The caller must call `release_refresh` when done, or else the refresh expires after `timeout` seconds."""
+        now = time.time()
+        with self.lock:
+            if self.refreshing.get(key, 0) > now: return False
+            self.refreshing[key] = now + timeout
+            return True
+
+    def release_refresh(self, key):
+        """Marks the value for `key` as no longer being refreshed."""
+        with self.lock:
+            self.refreshing.pop(key, None)
+
+class SQLiteCache:
+    """
+    Cache backend that stores entries in an SQLite database. Entries are shared between every process that opens the same database file, such as WSGI worker processes.
+
+    The database keeps up to `maxsize` entries, evicting the least recently updated entries first. The `memory_maxsize` most recently used entries are also kept in memory, so that looking one up only needs to check that it hasn't been updated since, rather than loading and parsing the whole value.
+
+    See `MemoryCache` for details about the methods.
+    """
+    def __init__(self, path, maxsize=10000, memory_maxsize=500):
+        self.path, self.maxsize = path, maxsize
+        self.local = threading.local() # SQLite connections can't be shared between threads
+        self.memory = cachetools.LRUCache(maxsize=memory_maxsize) # mapping from keys to the same 2-tuples as `get` returns
+        self.memory_lock = threading.Lock()
+        connection = self.connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, updated REAL NOT NULL DEFAULT 0, refresh_until REAL NOT NULL DEFAULT 0)")
+        connection.execute("CREATE INDEX IF NOT EXISTS entries_updated ON entries (updated)")
+
+    def connection(self):
+        if not hasattr(self.local, "connection"):
+            self.local.connection = sqlite3.connect(self.path, timeout=30, isolation_level=None) # autocommit mode, so every statement is atomic by itself
+            self.local.connection.execute("PRAGMA journal_mode=WAL") # readers don't block writers
+        return self.local.connection
+
+    def get(self, key):
+        updated = self.updated(key)
+        if updated is None: return None
+        with self.memory_lock:
+            entry = self.memory.get(key)
+        if entry is not None and entry[1] == updated: return entry # another process might have updated the value, so only use the copy in memory if it's still current
+        row = self.connection().execute("SELECT value, updated FROM entries WHERE key = ? AND value IS NOT NULL", (key,)).fetchone()
+        if row is None: return None
+        entry = (json.loads(row[0]), row[1])
+        with self.memory_lock:
+            self.memory[key] = entry
+        return entry
+
+    def updated(self, key):
+        row = self.connection().execute("SELECT updated FROM entries WHERE key = ? AND value IS NOT NULL", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key, value, updated):
+        connection = self.connection()
+        connection.execute("INSERT OR REPLACE INTO entries (key, value, updated, refresh_until) VALUES (?, ?, ?, 0)", (key, json.dumps(value), updated))
+        connection.execute("DELETE FROM entries WHERE key IN (SELECT key FROM entries WHERE refresh_until <= ? ORDER BY updated DESC LIMIT -1 OFFSET ?)", (time.time(), self.maxsize)) # evict the least recently updated entries, except ones being refreshed
+        with self.memory_lock:
+            self.memory[key] = (value, updated)
+
+    def acquire_refresh(self, key, timeout):
+        now = time.time()
+        connection = self.connection()
+        connection.execute("INSERT OR IGNORE INTO entries (key) VALUES (?)", (key,))
+        return connection.execute("UPDATE entries SET refresh_until = ? WHERE key = ? AND refresh_until <= ?", (now + timeout, key, now)).rowcount == 1
+
+    def release_refresh(self, key):
+        self.connection().execute("UPDATE entries SET refresh_until = 0 WHERE key = ?", (key,))
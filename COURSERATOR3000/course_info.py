@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 
 import re
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 try:
-    from .uwapi import uwapi # relative import
+    from .uwapi import uwapi, uwapi_updated # relative import
 except SystemError: # not being used as a module
-    from uwapi import uwapi # normal import
+    from uwapi import uwapi, uwapi_updated # normal import
+
+# shared thread pool for making API requests concurrently, since each request spends most of its time waiting on the network
+executor = ThreadPoolExecutor(max_workers=16)
 
 def parse_date(date_string, default_date):
     """Given a string `date_string` of the form MM/DD or YY/MM/DD or YYYY-MM-DD, returns the date it represents."""
@@ -27,9 +33,18 @@ def get_term_names(max_term_count = 5):
     )
     return str(response["next_term"]), entries[-max_term_count:]
 
+def term_dates_endpoint(term):
+    return "terms/{term}/importantdates".format(term=term)
+
+def course_schedule_endpoint(term, course):
+    assert isinstance(course, str)
+    subject, catalog_number = re.match("^\s*([a-zA-Z]+)\s*(\d\w*)\s*$", course).groups()
+    assert subject and catalog_number
+    return "terms/{term}/{subject}/{catalog_number}/schedule".format(term=term, subject=subject, catalog_number=catalog_number)
+
 def get_term_start_end_dates(term):
     """Returns the dates that lectures start and end for the given term code `term`."""
-    response = uwapi("terms/{term}/importantdates".format(term=term))
+    response = uwapi(term_dates_endpoint(term))
 
     # compute default dates to use in case we can't find the lecture start/end dates for the term
     match = re.match("^(\d)(\d\d)(\d)$", term)
@@ -47,20 +62,41 @@ def get_term_start_end_dates(term):
     return start_date, end_date
 
 def get_courses_data(term, course_list):
+    """
+    Fetches the schedules of every course in `course_list` for the term code `term`, with all the requests made concurrently.
+
+    Returns a 2-tuple containing a dictionary mapping course names to schedule data for every course that was fetched successfully, and a dictionary mapping course names to error messages for every course that couldn't be fetched.
+    """
     assert isinstance(term, str)
-    result = {}
+    pending = {}
     for course in course_list:
-        assert isinstance(course, str)
-        subject, catalog_number = re.match("^\s*([a-zA-Z]+)\s*(\d\w*)\s*$", course).groups()
-        assert subject and catalog_number
-        result[course] = uwapi("terms/{term}/{subject}/{catalog_number}/schedule".format(term=term, subject=subject, catalog_number=catalog_number))
-    return result
+        pending[course] = executor.submit(uwapi, course_schedule_endpoint(term, course))
 
-def get_class_times(description, default_start_date, default_end_date):
-    #wip: do something with "is_closed" and "enrollment_capacity" and "enrollment_total", like an option to use even closed classes
+    result, errors = {}, {}
+    for course, future in pending.items():
+        try:
+            result[course] = future.result()
+        except Exception as e: # report the failure and keep the courses that did work
+            errors[course] = str(e) or type(e).__name__
+    return result, errors
+
+def get_data_updated(term, course_list):
+    """Returns the time the API data for the term code `term` and the courses in `course_list` was last updated (in seconds since the epoch), or None if some of it hasn't been fetched yet."""
+    updated = [uwapi_updated(term_dates_endpoint(term))] + [uwapi_updated(course_schedule_endpoint(term, course)) for course in course_list]
+    return None if None in updated else max(updated)
+
+EPOCH = datetime(1970, 1, 1)
+WEEKDAY_OFFSETS = {"M": 0, "T": 1, "W": 2, "Th": 3, "F": 4, "S": 5, "Su": 6}
+
+def parse_class_date(description, default_start_date, default_end_date):
+    """
+    Parses the `date` entry of a class into a 5-tuple `(daily_start_offset, daily_end_offset, weekdays, start_date, end_date)`, or None if the class has no scheduled times.
+
+    `weekdays` is a list of weekday numbers (0 is Monday), and the class meets on those weekdays from `start_date` inclusive until `end_date` exclusive.
+    """
     start_time_string, end_time_string, weekdays = description["start_time"], description["end_time"], description["weekdays"]
     if start_time_string is None or end_time_string is None or weekdays is None:
-        return []
+        return None
     start_date_string, end_date_string = description["start_date"], description["end_date"]
 
     # parse class imes like "14:05" into offsets from the beginning of the day
@@ -69,12 +105,8 @@ def get_class_times(description, default_start_date, default_end_date):
     hours, minutes = end_time_string.split(":")
     daily_end_offset = timedelta(minutes=int(minutes), hours=int(hours))
 
-    # parse weekdays like "TThF" into a list of 2-tuples containing the offset of the beginning/end of each class for a given week
-    weekday_offsets = {"M": 0, "T": 1, "W": 2, "Th": 3, "F": 4, "S": 5, "Su": 6}
-    weekly_class_offsets = []
-    for day in re.findall(r"Th|Su|M|T|W|F|S", weekdays):
-        current_day = timedelta(days=weekday_offsets[day])
-        weekly_class_offsets.append((current_day + daily_start_offset, current_day + daily_end_offset))
+    # parse weekdays like "TThF" into a list of weekday numbers
+    weekday_list = [WEEKDAY_OFFSETS[day] for day in re.findall(r"Th|Su|M|T|W|F|S", weekdays)]
 
     # parse start/end dates
     if start_date_string is not None:
@@ -86,30 +118,146 @@ def get_class_times(description, default_start_date, default_end_date):
     else:
         end_date = default_end_date + timedelta(days=1) # add one day to include the ending date
 
+    return daily_start_offset, daily_end_offset, weekday_list, start_date, end_date
+
+def to_minutes(value):
+    """Returns the `datetime` `value` as a number of minutes since the Unix epoch."""
+    return (value - EPOCH) // timedelta(minutes=1)
+
+def from_minutes(minutes):
+    """Returns the `datetime` that is `minutes` minutes since the Unix epoch."""
+    return EPOCH + timedelta(minutes=minutes)
+
+class SectionTimes:
+    """
+    Compact representation of every meeting of a section.
+
+    Blocks are stored as two parallel arrays `starts` and `ends` containing the start/end times of each meeting in minutes since the Unix epoch, sorted by start time. `patterns` is a list of the weekly meeting patterns of the section (see `get_class_patterns`), or None if the section can't be represented as weekly meeting patterns.
+    """
+    __slots__ = ("starts", "ends", "patterns")
+
+    def __init__(self, blocks, patterns=None):
+        blocks = sorted(blocks)
+        self.starts = array("q", (start for start, end in blocks))
+        self.ends = array("q", (end for start, end in blocks))
+        self.patterns = patterns
+
+    @classmethod
+    def from_datetimes(cls, blocks, patterns=None):
+        """Returns a `SectionTimes` for a list of blocks, where each block is a 2-tuple containing start/end `datetime`s."""
+        return cls([(to_minutes(start), to_minutes(end)) for start, end in blocks], patterns)
+
+    @classmethod
+    def from_arrays(cls, starts, ends, patterns=None):
+        """Returns a `SectionTimes` that uses `starts` and `ends` directly, without copying. They must already be sorted by start time, and can be any sequences of integers, like memoryviews of a memory-mapped file."""
+        result = cls.__new__(cls)
+        result.starts, result.ends, result.patterns = starts, ends, patterns
+        return result
+
+    def __reduce__(self): # memoryviews can't be pickled, so copy the times into arrays when sending them to another process
+        return (SectionTimes.from_arrays, (array("q", self.starts), array("q", self.ends), self.patterns))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        """Iterates over each meeting as a 2-tuple containing the start/end `datetime`s."""
+        for start, end in zip(self.starts, self.ends):
+            yield from_minutes(start), from_minutes(end)
+
+    def earliest(self):
+        """Returns the earliest time of day any meeting starts at as a string like "08:30", or None if there are no meetings."""
+        if not self.starts: return None
+        return "{:02}:{:02}".format(*divmod(min(start % (24 * 60) for start in self.starts), 60))
+
+    def latest(self):
+        """Returns the latest time of day any meeting ends at as a string like "17:20", or None if there are no meetings."""
+        if not self.ends: return None
+        return "{:02}:{:02}".format(*divmod(max(end % (24 * 60) for end in self.ends), 60))
+
+    def weekly_meetings(self):
+        """Returns a list of 3-tuples of the form `(weekday, start_minute, end_minute)` for every meeting that repeats weekly, ignoring one-off meetings like tests. Weekdays are numbers where 0 is Monday, and times are minutes after midnight."""
+        counts = Counter(((start // (24 * 60) + EPOCH.weekday()) % 7, start % (24 * 60), start % (24 * 60) + (end - start)) for start, end in zip(self.starts, self.ends)) # days since the epoch give the weekday without creating a `datetime` for every meeting
+        return sorted(meeting for meeting, count in counts.items() if count > 1)
+
+def get_class_blocks(description, default_start_date, default_end_date):
+    """Returns a list of 2-tuples containing the start/end times of every meeting of a class, in minutes since the Unix epoch."""
+    #wip: do something with "is_closed" and "enrollment_capacity" and "enrollment_total", like an option to use even closed classes
+    class_date = parse_class_date(description, default_start_date, default_end_date)
+    if class_date is None:
+        return []
+    daily_start_offset, daily_end_offset, weekdays, start_date, end_date = class_date
+    daily_start_offset, daily_end_offset = daily_start_offset // timedelta(minutes=1), daily_end_offset // timedelta(minutes=1)
+
+    # list of 2-tuples containing the offset of the beginning/end of each class for a given week
+    weekly_class_offsets = []
+    for weekday in weekdays:
+        current_day = weekday * 24 * 60
+        weekly_class_offsets.append((current_day + daily_start_offset, current_day + daily_end_offset))
+
     # generate class list using the date range, days of week, and times of day
+    start, end = to_minutes(start_date), to_minutes(end_date)
     all_class_times = []
-    current_week_start = start_date - timedelta(days=start_date.weekday())  # beginning of the week containing the start date
-    while current_week_start < end_date:
+    current_week_start = start - start_date.weekday() * 24 * 60  # beginning of the week containing the start date
+    while current_week_start < end:
         for class_start_offset, class_end_offset in weekly_class_offsets:
             class_start = current_week_start + class_start_offset
             class_end = current_week_start + class_end_offset
-            if class_start >= start_date and class_end <= end_date:
+            if class_start >= start and class_end <= end:
                 all_class_times.append((class_start, class_end))
 
-        current_week_start += timedelta(weeks=1)  # move to the next week
+        current_week_start += 7 * 24 * 60  # move to the next week
 
     return all_class_times
 
+def get_class_patterns(description, default_start_date, default_end_date):
+    """
+    Returns the weekly meeting patterns of a class, or None if the class can't be represented as weekly meeting patterns (for example, a class that runs past midnight).
+
+    A meeting pattern is a 5-tuple `(weekday, start_minute, end_minute, start_date, end_date)`, representing a meeting every `weekday` (0 is Monday) from `start_date` inclusive until `end_date` exclusive, from `start_minute` until `end_minute` minutes after midnight.
+    """
+    class_date = parse_class_date(description, default_start_date, default_end_date)
+    if class_date is None:
+        return []
+    daily_start_offset, daily_end_offset, weekdays, start_date, end_date = class_date
+    start_minute, end_minute = daily_start_offset // timedelta(minutes=1), daily_end_offset // timedelta(minutes=1)
+    if not 0 <= start_minute < end_minute <= 24 * 60:
+        return None
+    return [(weekday, start_minute, end_minute, start_date, end_date) for weekday in weekdays]
+
 def get_courses_sections(courses_data, default_start_date, default_end_date):
+    """
+    Returns a dictionary mapping sections to `SectionTimes` instances describing every meeting of that section.
+
+    Sections with classes that can't be represented as weekly meeting patterns have their `patterns` set to None.
+    """
     result = {}
     for course_name, course_data in courses_data.items():
         for section in course_data:
-            times = []
+            blocks, patterns = [], []
             for classes in section["classes"]:
-                times += get_class_times(classes["date"], default_start_date, default_end_date)
-            result[(course_name, section["section"])] = sorted(times, key=lambda x: x[0])
+                blocks += get_class_blocks(classes["date"], default_start_date, default_end_date)
+                class_patterns = get_class_patterns(classes["date"], default_start_date, default_end_date)
+                patterns = None if patterns is None or class_patterns is None else patterns + class_patterns
+            result[(course_name, section["section"])] = SectionTimes(blocks, patterns)
     return result
 
+def get_section_instructors(courses_data):
+    """Returns a dictionary mapping every section to the set of instructors teaching it."""
+    return {
+        (course_name, section["section"]): {instructor for classes in section["classes"] for instructor in classes["instructors"]}
+        for course_name, course_data in courses_data.items()
+        for section in course_data
+    }
+
+def get_section_headroom(courses_data):
+    """Returns a dictionary mapping every section to the number of open seats in it (negative if it's over capacity), or None if its enrollment isn't known."""
+    return {
+        (course_name, section["section"]): None if section.get("enrollment_capacity") is None or section.get("enrollment_total") is None else section["enrollment_capacity"] - section["enrollment_total"]
+        for course_name, course_data in courses_data.items()
+        for section in course_data
+    }
+
 def get_section_entries(courses_data, section_list):
     result = {}
     for course_name, section_name in section_list:
@@ -119,5 +267,6 @@ def get_section_entries(courses_data, section_list):
     return result
 
 if __name__ == "__main__":
-    courses_data = get_courses_data(1151, ["CS240"])
-    print(get_courses_sections(courses_data, datetime(2015, 1, 5), datetime(2015, 5, 1)))
+    courses_data, errors = get_courses_data("1151", ["CS240"])
+    for section, times in get_courses_sections(courses_data, datetime(2015, 1, 5), datetime(2015, 5, 1)).items():
+        print(section, list(times))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import contextlib
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10) # histogram bucket upper bounds, in seconds
+
+# descriptions of every metric, shown on the metrics page
+DESCRIPTIONS = {
+    "courserator_requests_total": "HTTP requests handled, by endpoint and status code.",
+    "courserator_request_seconds": "Time taken to handle HTTP requests, by endpoint.",
+    "courserator_stage_seconds": "Time taken by each stage of computing schedules.",
+    "courserator_schedules_cache_total": "Schedule responses looked up in the response cache, by whether they were found.",
+    "courserator_uwapi_requests_total": "API data lookups, by whether they were served from the cache (hit), served from the cache while being refreshed (stale), or had to wait for the API (miss).",
+    "courserator_uwapi_fetch_seconds": "Time taken by requests to the API, by whether they succeeded.",
+}
+
+counters = {} # mapping from metric names to dictionaries mapping label tuples to values
+histograms = {} # mapping from metric names to dictionaries mapping label tuples to lists of bucket counts, followed by the sum and count of the observations
+metrics_lock = threading.Lock()
+current = threading.local() # stage timings for the request being handled by the current thread
+
+def get_labels(labels):
+    return tuple(sorted(labels.items()))
+
+def increment(name, amount=1, **labels):
+    """Adds `amount` to the counter `name` with the labels `labels`."""
+    key = get_labels(labels)
+    with metrics_lock:
+        values = counters.setdefault(name, {})
+        values[key] = values.get(key, 0) + amount
+
+def observe(name, value, **labels):
+    """Records `value` in the histogram `name` with the labels `labels`."""
+    key = get_labels(labels)
+    with metrics_lock:
+        values = histograms.setdefault(name, {})
+        if key not in values: values[key] = [0] * (len(DEFAULT_BUCKETS) + 2)
+        entry = values[key]
+        for index, bound in enumerate(DEFAULT_BUCKETS):
+            if value <= bound: entry[index] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+def start_request():
+    """Starts collecting stage timings for a request handled by the current thread."""
+    current.stages = {}
+
+def finish_request():
+    """Returns a dictionary mapping stage names to the total time spent in them (in seconds) since `start_request` was called on the current thread, and stops collecting them."""
+    stages = getattr(current, "stages", None)
+    current.stages = None
+    return stages or {}
+
+@contextlib.contextmanager
+def timed(stage):
+    """Context manager that records the time taken by its body in the `courserator_stage_seconds` histogram, and in the stage timings of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        observe("courserator_stage_seconds", duration, stage=stage)
+        stages = getattr(current, "stages", None)
+        if stages is not None: stages[stage] = stages.get(stage, 0) + duration
+
+def record_stages(stages):
+    """Records stage timings from `finish_request` that were measured in another process, as if they were measured with `timed`."""
+    current_stages = getattr(current, "stages", None)
+    for stage, duration in stages.items():
+        observe("courserator_stage_seconds", duration, stage=stage)
+        if current_stages is not None: current_stages[stage] = current_stages.get(stage, 0) + duration
+
+def format_labels(labels, extra=()):
+    labels = list(labels) + list(extra)
+    if not labels: return ""
+    escape = lambda value: str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return "{" + ",".join("{}=\"{}\"".format(key, escape(value)) for key, value in labels) + "}"
+
+def render():
+    """Returns every metric in this process, in the Prometheus text exposition format."""
+    lines = []
+    with metrics_lock:
+        for name, values in sorted(counters.items()):
+            lines += ["# HELP {} {}".format(name, DESCRIPTIONS.get(name, name)), "# TYPE {} counter".format(name)]
+            lines += ["{}{} {}".format(name, format_labels(labels), value) for labels, value in sorted(values.items())]
+        for name, values in sorted(histograms.items()):
+            lines += ["# HELP {} {}".format(name, DESCRIPTIONS.get(name, name)), "# TYPE {} histogram".format(name)]
+            for labels, entry in sorted(values.items()):
+                for bound, count in zip(DEFAULT_BUCKETS, entry):
+                    lines.append("{}_bucket{} {}".format(name, format_labels(labels, [("le", bound)]), count))
+                lines.append("{}_bucket{} {}".format(name, format_labels(labels, [("le", "+Inf")]), entry[-1]))
+                lines.append("{}_sum{} {}".format(name, format_labels(labels), entry[-2]))
+                lines.append("{}_count{} {}".format(name, format_labels(labels), entry[-1]))
+    return "\n".join(lines) + "\n"
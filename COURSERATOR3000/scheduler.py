@@ -1,15 +1,50 @@
 #!/usr/bin/env python3
 
+import functools
+import heapq
 import itertools
+import hashlib
+import logging
+import math
+import operator
+import threading
+import time
+from collections import defaultdict, namedtuple
+from datetime import timedelta
 
+import cachetools
 import pycosat
 
+try:  # when used as a module, do relative import
+    from . import metrics
+except SystemError:  # not being used as a module, do normal import
+    import metrics
+
+logger = logging.getLogger(__name__)
+
+# cache of conflicts between pairs of courses, keyed by the signatures of both courses (see `get_cached_conflicts`)
+# its size is the total number of conflicting pairs of sections it holds (plus one per entry, so that entries without conflicts count too)
+CONFLICTS_CACHE_SIZE = 1000000
+conflicts_cache = cachetools.LRUCache(maxsize=CONFLICTS_CACHE_SIZE, getsizeof=lambda conflicts: len(conflicts) + 1)
+conflicts_cache_lock = threading.Lock()
+
+ENCODINGS = ("pairwise", "sequential", "commander") # CNF encodings for requirements (see `Scheduler.constrain_at_most_one`)
+
+class DeadlineExceeded(Exception):
+    """Raised when a deadline passes before a scheduler is done being built (see `build_scheduler`)."""
+
 class Scheduler:
-    def __init__(self):
+    def __init__(self, encoding="pairwise"):
+        assert encoding in ENCODINGS
+        self.encoding = encoding
         self.constraints = []
         self.variable_index = 1 # used to generate unique variable names
         self.name_mapping = {}
         self.index_mapping = {}
+        self.requirements = [] # lists of variables where exactly one must be true
+        self.conflicts = defaultdict(set) # mapping from variables to the variables they conflict with
+        self.requirement_mapping = {} # mapping from variables to the index of the requirement they belong to
+        self.alternatives = defaultdict(list) # mapping from variables to sections that are interchangeable with them, which `solve` substitutes in
 
     def constrain_requirement(self, variable_list):
         """
@@ -18,7 +53,7 @@ class Scheduler:
         Generates CNF constraints such that exactly one of the variables in `variable_list` is true.
         """
         self.constraints.append(variable_list) # at least one variable is true
-        self.constrain_conflict(variable_list) # every option of the same course conflicts with every other, to disallow taking the same course twice
+        self.constrain_at_most_one(variable_list) # every option of the same course conflicts with every other, to disallow taking the same course twice
 
     def constrain_conflict(self, variable_list):
         """
@@ -28,13 +63,100 @@ class Scheduler:
         """
         self.constraints += ([-a, -b] for a, b in itertools.combinations(variable_list, 2)) # no more than one variable is true
 
+    def constrain_at_most_one(self, variable_list):
+        """
+        Generates CNF constraints such that zero or one of the variables in `variable_list` is true, using the encoding `self.encoding`.
+
+        The pairwise encoding uses $O(n^2)$ clauses. The sequential counter and commander encodings use $O(n)$ clauses, by introducing auxiliary variables. Each auxiliary variable is constrained to be equivalent to a disjunction of the variables in `variable_list`, so every schedule corresponds to exactly one solution.
+        """
+        if self.encoding == "pairwise" or len(variable_list) <= 4: # small lists are smaller with the pairwise encoding anyways
+            self.constrain_conflict(variable_list)
+        elif self.encoding == "sequential":
+            # auxiliary variable `counters[i]` is true if and only if one of the first `i + 1` variables is true
+            counters = [variable_list[0]] + [self.new_variable() for _ in variable_list[1:-1]]
+            for index in range(1, len(variable_list) - 1):
+                variable, counter, previous_counter = variable_list[index], counters[index], counters[index - 1]
+                self.constraints += [[-variable, counter], [-previous_counter, counter], [-counter, previous_counter, variable]]
+            for index in range(1, len(variable_list)):
+                self.constraints.append([-variable_list[index], -counters[index - 1]]) # no variable is true if one before it is true
+        else: # commander encoding
+            commanders = []
+            for index in range(0, len(variable_list), 3): # split the list into groups of 3, each with a commander variable that is true if and only if one of the group's variables is true
+                group = variable_list[index:index + 3]
+                commander = self.new_variable()
+                self.constraints.append([-commander] + group)
+                self.constraints += ([-variable, commander] for variable in group)
+                self.constrain_conflict(group)
+                commanders.append(commander)
+            self.constrain_at_most_one(commanders)
+
+    def new_variable(self):
+        """Returns a new auxiliary variable, which doesn't correspond to any section."""
+        result = self.variable_index
+        self.variable_index += 1
+        return result
+
     def solve(self):
         """
         Produces an iterator for schedule possibilities that have no conflicts.
 
-        Solves the constraints using a SAT solving algorithm and processes the results.
+        Solves the constraints using a SAT solving algorithm and processes the results. Each solution is first produced with only the first of its interchangeable sections (see `add_equivalent_sections`), so that schedules with different meeting times come first, and the schedules substituting the others in follow once every solution has been found.
         """
-        return ([self.index_mapping[y] for y in x if y > 0] for x in pycosat.itersolve(self.constraints))
+        expansions = [] # interchangeable sections of every solution found so far that has any
+        for solution in pycosat.itersolve(self.constraints, vars=self.variable_index - 1):
+            sections = [[self.index_mapping[y]] + self.alternatives[y] for y in solution if y > 0 and y in self.index_mapping]
+            yield [options[0] for options in sections]
+            if any(len(options) > 1 for options in sections): expansions.append(sections)
+        for sections in expansions:
+            for schedule in itertools.islice(itertools.product(*sections), 1, None): # the first schedule was already produced
+                yield list(schedule)
+
+    def best(self, count, section_cost, schedule_cost, schedule_bound, deadline=None, schedule_filter=None):
+        """
+        Produces a 2-tuple containing a list of up to `count` schedule possibilities that have no conflicts, with the lowest costs, in order of increasing cost, and whether the search finished.
+
+        The cost of a schedule is the sum of `section_cost(section)` for every section in the schedule, plus `schedule_cost(sections)` for the schedule as a whole. All costs must be non-negative.
+
+        Searches for schedules with a branch-and-bound algorithm, choosing a section for one requirement at a time. `schedule_bound(sections)` must never be more than `schedule_cost` of any schedule containing `sections`, and is used to skip every schedule containing `sections` once it can't beat the schedules already found.
+
+        If `schedule_filter` is given, only schedules where `schedule_filter(sections)` is true are produced. `schedule_filter(sections, False)` is used to skip every schedule containing `sections` that are only part of a schedule, so it must only be false if `schedule_filter` is false for every schedule containing them.
+
+        If `deadline` (in seconds since the epoch) passes before the search finishes, the search stops early and the best schedules found so far are produced instead.
+        """
+        requirements = sorted(self.requirements, key=len) # requirements with fewer options first, so conflicts are found sooner
+        if count <= 0 or any(len(requirement) == 0 for requirement in requirements): return [], True
+        costs = {variable: section_cost(self.index_mapping[variable]) for requirement in requirements for variable in requirement}
+
+        # lower bound on the section costs for the requirements after each index
+        remaining_bounds = [0] * (len(requirements) + 1)
+        for index in reversed(range(len(requirements))):
+            remaining_bounds[index] = remaining_bounds[index + 1] + min(costs[variable] for variable in requirements[index])
+
+        order = itertools.count()
+        best = [] # heap of the best schedules found so far as tuples of the form `(-cost, -order, variables)`, with the worst at the top
+        chosen = []
+        complete = True
+        def search(index, cost):
+            nonlocal complete
+            if not complete: return
+            if deadline is not None and time.time() >= deadline: # out of time, stop searching
+                complete = False
+                return
+            sections = [self.index_mapping[variable] for variable in chosen]
+            if len(best) == count and cost + remaining_bounds[index] + schedule_bound(sections) >= -best[0][0]: return # can't beat any schedule found so far
+            if schedule_filter is not None and not schedule_filter(sections, index == len(requirements)): return # every schedule containing these sections is filtered out
+            if index == len(requirements):
+                entry = (-(cost + schedule_cost(sections)), -next(order), sorted(chosen)) # among equal costs, schedules found earlier are better
+                if len(best) < count: heapq.heappush(best, entry)
+                elif entry > best[0]: heapq.heapreplace(best, entry)
+                return
+            for variable in sorted(requirements[index], key=costs.get):
+                if any(variable in self.conflicts[other] for other in chosen): continue
+                chosen.append(variable)
+                search(index + 1, cost + costs[variable])
+                chosen.pop()
+        search(0, 0)
+        return [[self.index_mapping[variable] for variable in variables] for _, _, variables in sorted(best, reverse=True)], complete
 
     def register_variable(self, name):
         if name in self.name_mapping: return self.name_mapping[name]
@@ -46,45 +168,153 @@ class Scheduler:
 
     def add_requirement(self, name, sections):
         section_variables = [self.register_variable((name, section)) for section in sections]
+        for variable in section_variables: self.requirement_mapping[variable] = len(self.requirements)
+        self.requirements.append(section_variables)
         self.constrain_requirement(section_variables)
 
     def add_conflict(self, section1, section2):
         conflict_variables = [self.register_variable(section1), self.register_variable(section2)]
+        if conflict_variables[1] in self.conflicts[conflict_variables[0]]: return # already added this conflict
+        if conflict_variables[0] in self.requirement_mapping and self.requirement_mapping.get(conflict_variables[0]) == self.requirement_mapping.get(conflict_variables[1]): return # sections of the same requirement already conflict
+        self.conflicts[conflict_variables[0]].add(conflict_variables[1])
+        self.conflicts[conflict_variables[1]].add(conflict_variables[0])
         self.constrain_conflict(conflict_variables)
 
-def block_compare(block1, block2):
-    """
-    Produces 0 if the blocks conflict, -1 if `block1` precedes `block2`, and 1 if `block1` follows `block2`.
+    def add_equivalent_sections(self, sections):
+        """
+        Marks every section in `sections` as interchangeable, which must all be sections of the same requirement with identical meeting times.
 
-    Blocks are 2-tuples where the first element is the start time of a section block as a `datetime`, and the second element is the block duration as a `timedelta`.
-    """
-    if block1[1] <= block2[0]: return -1 # `block1` is too early to conflict with `block2`
-    if block1[0] >= block2[1]: return 1 # `block1` is too late to conflict with `block2`
-    return 0 # blocks conflict with each other
+        This breaks the symmetry between them: only the first section is allowed in solutions, and `solve` substitutes each of the others for it in every solution. The other sections don't need to be part of any requirement.
+        """
+        variable = self.register_variable(sections[0])
+        self.constraints += ([-self.name_mapping[section]] for section in sections[1:] if section in self.name_mapping)
+        self.alternatives[variable] += sections[1:]
 
 def check_section_conflict(section1, section2): # $O(n)$ where $n$ is `max(len(section1), len(section2))`
     """
     Produces True if `section1` conflicts with `section2`, and False otherwise.
 
-    Sections are lists of blocks.
+    Sections are `course_info.SectionTimes` instances, or any object with `starts` and `ends` sequences of block start/end times sorted by start time.
     """
+    starts1, ends1, starts2, ends2 = section1.starts, section1.ends, section2.starts, section2.ends
     index1, index2 = 0, 0
-    while index1 < len(section1) and index2 < len(section2):
-        status = block_compare(section1[index1], section2[index2])
-        if status == -1: index1 += 1
-        elif status == 1: index2 += 1
+    while index1 < len(starts1) and index2 < len(starts2):
+        if ends1[index1] <= starts2[index2]: index1 += 1 # block from `section1` is too early to conflict with the block from `section2`
+        elif starts1[index1] >= ends2[index2]: index2 += 1 # block from `section1` is too late to conflict with the block from `section2`
         else: # found conflicting block
             return True
     return False
 
-def get_conflicts(requirements, course_sections): # O(pretty bad, but still polynomial at least)
-    for (name1, requirements1), (name2, requirements2) in itertools.combinations(requirements.items(), 2):
-        for section_name1 in requirements1:
-            section_blocks1 = course_sections[(name1[0], section_name1)]
-            for section_name2 in requirements2:
-                section_blocks2 = course_sections[(name2[0], section_name2)]
-                if check_section_conflict(section_blocks1, section_blocks2):
-                    yield (name1[0], section_name1), (name2[0], section_name2)
+def patterns_conflict(pattern1, pattern2):
+    """
+    Produces True if the weekly meeting patterns `pattern1` and `pattern2` have a meeting in common, and False otherwise.
+
+    Meeting patterns are 5-tuples of the form `(weekday, start_minute, end_minute, start_date, end_date)` (see `course_info.get_class_patterns`).
+    """
+    weekday, start_minute1, end_minute1, start_date1, end_date1 = pattern1
+    weekday2, start_minute2, end_minute2, start_date2, end_date2 = pattern2
+    if weekday != weekday2 or end_minute1 <= start_minute2 or end_minute2 <= start_minute1: return False
+    first_date, last_date = max(start_date1, start_date2), min(end_date1, end_date2)
+    first_meeting = first_date + timedelta(days=(weekday - first_date.weekday()) % 7) # first date in the shared date range that falls on the weekday
+    return first_meeting < last_date
+
+def get_conflicts(requirements, course_sections, courses=None, deadline=None): # $O(n \log n + k)$ where $n$ is the number of meeting patterns and $k$ is the number of overlapping patterns
+    """
+    Produces pairs of conflicting sections from different requirements.
+
+    Sections with weekly meeting patterns are checked with a single sweep over the week, while sections without them fall back to comparing their blocks.
+
+    If `courses` is specified, only pairs of sections where at least one of them belongs to a course in `courses` are checked. If `deadline` (in seconds since the epoch) passes before all of them are checked, this raises `DeadlineExceeded`.
+    """
+    requirement_index = {} # mapping from sections to the index of the requirement they belong to
+    for index, (name, requirement_sections) in enumerate(requirements.items()):
+        for section_name in requirement_sections:
+            requirement_index[(name[0], section_name)] = index
+
+    conflicts = set()
+    def add_conflict(section1, section2):
+        if requirement_index[section1] > requirement_index[section2]: section1, section2 = section2, section1
+        conflicts.add((section1, section2))
+
+    # sweep over the week in order of meeting start time, keeping track of meetings that are still ongoing
+    meetings = sorted(
+        (pattern[0] * 24 * 60 + pattern[1], pattern[0] * 24 * 60 + pattern[2], pattern, section)
+        for section in requirement_index if course_sections[section].patterns is not None
+        for pattern in course_sections[section].patterns
+    )
+    ongoing = []
+    for start, end, pattern, section in meetings:
+        if deadline is not None and time.time() >= deadline: raise DeadlineExceeded()
+        ongoing = [meeting for meeting in ongoing if meeting[1] > start]
+        for _, _, other_pattern, other_section in ongoing:
+            if courses is not None and section[0] not in courses and other_section[0] not in courses: continue
+            if requirement_index[section] != requirement_index[other_section] and patterns_conflict(pattern, other_pattern):
+                add_conflict(section, other_section)
+        ongoing.append((start, end, pattern, section))
+
+    # irregular sections are checked block by block against every section in a different requirement
+    for section in requirement_index:
+        if course_sections[section].patterns is not None: continue
+        if deadline is not None and time.time() >= deadline: raise DeadlineExceeded()
+        for other_section in requirement_index:
+            if requirement_index[section] == requirement_index[other_section]: continue
+            if courses is not None and section[0] not in courses and other_section[0] not in courses: continue
+            if course_sections[other_section].patterns is None:
+                if requirement_index[other_section] < requirement_index[section]: continue # this pair is checked when the other section comes up
+            if check_section_conflict(course_sections[section], course_sections[other_section]):
+                add_conflict(section, other_section)
+
+    return sorted(conflicts, key=lambda pair: (requirement_index[pair[0]], requirement_index[pair[1]], pair))
+
+def get_course_signature(course, requirements, course_sections):
+    """Returns a string that uniquely identifies the course name and the meeting times of every section of the course `course` in `requirements`."""
+    signature = hashlib.sha1(course.encode("utf-8"))
+    for section in sorted((course, section_name) for name, sections in requirements.items() if name[0] == course for section_name in sections):
+        signature.update(b"\0" + section[1].encode("utf-8"))
+        signature.update(b"\0" + course_sections[section].starts.tobytes() + course_sections[section].ends.tobytes())
+    return signature.hexdigest()
+
+def cache_conflicts(key, conflicts):
+    """Stores `conflicts` in `conflicts_cache` under `key`, unless it's too large to fit in the cache at all. Must be called while holding `conflicts_cache_lock`."""
+    if conflicts_cache.getsizeof(conflicts) <= conflicts_cache.maxsize:
+        conflicts_cache[key] = conflicts
+
+def get_cached_conflicts(requirements, course_sections, conflict_index=None, deadline=None):
+    """
+    Produces the same pairs of conflicting sections as `get_conflicts`, reusing conflicts between pairs of courses from previous calls where possible.
+
+    Conflicts are cached for every pair of courses (including each course with itself), keyed by the signatures of both courses. When a course is added to a previously seen set of courses, only conflicts involving the new course have to be computed.
+
+    If `conflict_index` is specified, conflicts for pairs of courses that aren't cached are looked up with its `get_course_conflicts` method first (see `term_index.TermIndex`). `deadline` is the same as for `get_conflicts`.
+    """
+    courses = sorted({name[0] for name in requirements})
+    signatures = {course: get_course_signature(course, requirements, course_sections) for course in courses}
+    course_pairs = list(itertools.combinations_with_replacement(courses, 2))
+    with conflicts_cache_lock:
+        cached = {(course1, course2): conflicts_cache.get((signatures[course1], signatures[course2])) for course1, course2 in course_pairs}
+
+    # look up conflicts that were computed ahead of time
+    if conflict_index is not None:
+        indexed_conflicts = {pair: conflict_index.get_course_conflicts(pair[0], pair[1], requirements) for pair, conflicts in cached.items() if conflicts is None}
+        indexed_conflicts = {pair: conflicts for pair, conflicts in indexed_conflicts.items() if conflicts is not None}
+        with conflicts_cache_lock:
+            for (course1, course2), conflicts in indexed_conflicts.items():
+                cache_conflicts((signatures[course1], signatures[course2]), conflicts)
+        cached.update(indexed_conflicts)
+
+    # compute conflicts for every course that is part of a pair that isn't cached yet
+    new_courses = {course for pair, conflicts in cached.items() if conflicts is None for course in pair}
+    if new_courses:
+        new_conflicts = {pair: [] for pair in course_pairs if pair[0] in new_courses or pair[1] in new_courses}
+        for section1, section2 in get_conflicts(requirements, course_sections, new_courses, deadline):
+            if section1[0] > section2[0]: section1, section2 = section2, section1
+            new_conflicts[(section1[0], section2[0])].append((section1[1], section2[1]))
+        with conflicts_cache_lock:
+            for (course1, course2), conflicts in new_conflicts.items():
+                cache_conflicts((signatures[course1], signatures[course2]), conflicts)
+        cached.update(new_conflicts)
+
+    return [((course1, section_name1), (course2, section_name2)) for (course1, course2), conflicts in cached.items() for section_name1, section_name2 in conflicts]
 
 def get_requirements(course_sections): # group sections by course and instruction type
     from collections import defaultdict
@@ -94,46 +324,246 @@ def get_requirements(course_sections): # group sections by course and instructio
         requirements[category].append(section)
     return requirements
 
-def compute_schedules(course_sections):
+def collapse_equivalent_sections(requirements, course_sections):
+    """
+    Groups the sections of each requirement that have identical meeting times, like sections that only differ in their rooms or instructors.
+
+    Returns a 2-tuple containing a copy of `requirements` with only the first section of each group, and a list of the groups that contain more than one section.
+    """
+    collapsed, groups = {}, []
+    for name, sections in requirements.items():
+        classes = {} # mapping from meeting times to sections with those meeting times
+        for section_name in sections:
+            section_times = course_sections[(name[0], section_name)]
+            classes.setdefault((section_times.starts.tobytes(), section_times.ends.tobytes()), []).append(section_name)
+        collapsed[name] = [section_names[0] for section_names in classes.values()]
+        groups += ([(name[0], section_name) for section_name in section_names] for section_names in classes.values() if len(section_names) > 1)
+    return collapsed, groups
+
+def build_scheduler(course_sections, collapse_equivalent=True, conflict_index=None, deadline=None):
     """
-    Computes a list of valid schedules given a course sections map.
+    Returns a `Scheduler` with constraints for a course sections map. Its `solve` method lazily produces valid schedules.
 
-    A course sections map is a dictionary mapping sections to lists of blocks.
+    A course sections map is a dictionary mapping sections to `course_info.SectionTimes` instances, describing every meeting of that section.
 
     A section is a 2-tuple containing the course name and section name, both strings.
 
-    A block is a 2-tuple containing the start and end dates/times, both `datetime.datetime` objects. This represents a specific meeting event.
+    If `collapse_equivalent` is True, sections of the same requirement with identical meeting times are solved for as a single section, and only expanded back into the individual sections as schedules are produced by `solve`.
+
+    `conflict_index` is an optional source of conflicts computed ahead of time (see `get_cached_conflicts`). If `deadline` (in seconds since the epoch) passes before the scheduler is built, this raises `DeadlineExceeded`.
     """
     scheduler = Scheduler()
 
     # group sections by course and instruction type
     requirements = get_requirements(course_sections)
-    for requirement, sections in requirements.items():
-        scheduler.add_requirement(requirement[0], sections)
-
-    print("=========================================================")
-    print("=== generating conflict constraints")
-    print("=========================================================")
+    equivalent_sections = []
+    if collapse_equivalent:
+        requirements, equivalent_sections = collapse_equivalent_sections(requirements, course_sections)
 
     # find section conflicts
-    conflicts = list(get_conflicts(requirements, course_sections))
-    for section1, section2 in conflicts:
-        scheduler.add_conflict(section1, section2)
-    print("\n".join(sorted(section1[0] + " " + section1[1] + "\tconflicts with\t" + section2[0] + " " + section2[1] for section1, section2 in conflicts)))
+    with metrics.timed("conflicts"):
+        conflicts = get_cached_conflicts(requirements, course_sections, conflict_index, deadline)
+    if deadline is not None and time.time() >= deadline: raise DeadlineExceeded()
+
+    with metrics.timed("constraints"):
+        for requirement, sections in requirements.items():
+            scheduler.add_requirement(requirement[0], sections)
+        for sections in equivalent_sections:
+            scheduler.add_equivalent_sections(sections)
+        for section1, section2 in conflicts:
+            scheduler.add_conflict(section1, section2)
+    if logger.isEnabledFor(logging.DEBUG): # formatting every conflict is slow, so only do it when it will actually be logged
+        logger.debug("conflicts:\n%s", "\n".join(sorted(section1[0] + " " + section1[1] + "\tconflicts with\t" + section2[0] + " " + section2[1] for section1, section2 in conflicts)))
+
+    return scheduler
+
+def get_days_and_gaps(weekly_meetings):
+    """Returns a 2-tuple containing the number of days of the week with meetings, and the total minutes of gaps between meetings on the same day, given a list of weekly meetings (see `course_info.SectionTimes.weekly_meetings`)."""
+    days = defaultdict(list)
+    for weekday, start, end in weekly_meetings:
+        days[weekday].append((start, end))
+    gaps = 0
+    for meetings in days.values():
+        meetings.sort()
+        latest_end = meetings[0][1]
+        for start, end in meetings[1:]:
+            gaps += max(start - latest_end, 0)
+            latest_end = max(latest_end, end)
+    return len(days), gaps
+
+class SchedulePreferences:
+    """
+    Objectives for ranking schedules, as costs where lower is better.
+
+    Every weekly meeting starting before `earliest` (minutes after midnight, or None for no limit) costs `early_weight`. Every day of the week with classes costs `day_weight`. Every minute of gaps between classes on the same day costs `gap_weight`. If `instructors` is not empty, every section not taught by one of those instructors costs `instructor_weight`.
+
+    Only meetings that repeat weekly are considered, so one-off meetings like tests don't count as days on campus.
+    """
+    def __init__(self, course_sections, section_instructors, earliest=None, instructors=(), early_weight=100, day_weight=60, gap_weight=1, instructor_weight=30):
+        self.weekly_meetings = {section: section_times.weekly_meetings() for section, section_times in course_sections.items()}
+        self.section_instructors = section_instructors
+        self.earliest, self.instructors = earliest, set(instructors)
+        self.early_weight, self.day_weight, self.gap_weight, self.instructor_weight = early_weight, day_weight, gap_weight, instructor_weight
+
+    def section_cost(self, section):
+        cost = 0
+        if self.earliest is not None:
+            cost += self.early_weight * sum(1 for weekday, start, end in self.weekly_meetings[section] if start < self.earliest)
+        if self.instructors and not self.instructors & self.section_instructors.get(section, set()):
+            cost += self.instructor_weight
+        return cost
+
+    def schedule_cost(self, sections):
+        days, gaps = get_days_and_gaps([meeting for section in sections for meeting in self.weekly_meetings[section]])
+        return self.day_weight * days + self.gap_weight * gaps
+
+    def schedule_bound(self, sections): # adding sections never reduces the number of days with classes, but can fill in gaps
+        return self.day_weight * len({meeting[0] for section in sections for meeting in self.weekly_meetings[section]})
+
+SORT_KEYS = ("days", "gaps", "headroom") # stats that `ScheduleQuery` can sort schedules by
+
+# requested ranking preferences and filters, as hashable values that can be part of cache keys
+RankOptions = namedtuple("RankOptions", ["earliest", "instructors"]) # arguments for `SchedulePreferences`, with `instructors` as a tuple
+QueryOptions = namedtuple("QueryOptions", ["max_days", "max_gaps", "min_headroom", "sort"]) # arguments for `ScheduleQuery`
+
+class ScheduleStats:
+    """
+    Stats for schedules made of sections in a course sections map (see `build_scheduler`), computed in batch from values computed once for each section.
+
+    Days and gaps only consider meetings that repeat weekly, and headroom is the fewest open seats in any section, ignoring sections with unknown enrollment.
+    """
+    def __init__(self, course_sections, section_instructors, section_headroom):
+        self.sections = sorted(course_sections)
+        self.numbers = {section: number for number, section in enumerate(self.sections)}
+
+        # unknown values are stored as values that every known value beats, so that stats are plain minimums and maximums
+        self.earliest = [course_sections[section].earliest() or "~" for section in self.sections] # times of day like "08:30", which compare the same way as the times they represent
+        self.latest = [course_sections[section].latest() or "" for section in self.sections]
+        self.headroom = [math.inf if section_headroom.get(section) is None else section_headroom[section] for section in self.sections]
+
+        self.instructor_names = sorted({instructor for section in self.sections for instructor in section_instructors.get(section, ())})
+        instructor_bits = {instructor: 1 << index for index, instructor in enumerate(self.instructor_names)}
+        self.instructor_masks = [sum(instructor_bits[instructor] for instructor in section_instructors.get(section, ())) for section in self.sections]
+
+        self.meeting_lists = [] # distinct lists of weekly meetings, so that sections with identical meeting times share an entry
+        self.meeting_ids, self.weekday_masks = [], []
+        meeting_list_ids = {}
+        for section in self.sections + [None]:
+            meetings = () if section is None else tuple(course_sections[section].weekly_meetings())
+            if meetings not in meeting_list_ids:
+                meeting_list_ids[meetings] = len(self.meeting_lists)
+                self.meeting_lists.append(meetings)
+            self.meeting_ids.append(meeting_list_ids[meetings])
+            self.weekday_masks.append(sum({1 << weekday for weekday, start, end in meetings}))
+        self.gaps_cache = {} # mapping from tuples of the meeting list IDs of the sections in a schedule to the minutes of gaps between their meetings
 
-    print("=========================================================")
-    print("=== solving for schedules")
-    print("=========================================================")
+        # the last number is an empty section, for padding schedules with fewer sections than others
+        self.numbers[None] = len(self.sections)
+        self.earliest.append("~")
+        self.latest.append("")
+        self.headroom.append(math.inf)
+        self.instructor_masks.append(0)
 
-    schedules = []
-    limit = 500 # wip: boost this maybe
-    for index, schedule in enumerate(scheduler.solve()):
-        if index == limit: break
-        schedules.append(schedule)
+    def get_numbers(self, sections):
+        return [self.numbers[section] for section in sections]
+
+    def get_days(self, numbers):
+        return bin(functools.reduce(operator.or_, map(self.weekday_masks.__getitem__, numbers), 0)).count("1")
+
+    def get_gaps(self, numbers):
+        return self.get_cached_gaps(tuple(self.meeting_ids[number] for number in numbers))
+
+    def get_cached_gaps(self, meeting_ids):
+        if meeting_ids not in self.gaps_cache:
+            self.gaps_cache[meeting_ids] = get_days_and_gaps([meeting for meeting_id in meeting_ids for meeting in self.meeting_lists[meeting_id]])[1]
+        return self.gaps_cache[meeting_ids]
+
+    def get_headroom(self, numbers):
+        headroom = min(map(self.headroom.__getitem__, numbers), default=math.inf)
+        return None if headroom == math.inf else headroom
+
+    def get_stats(self, schedules):
+        """
+        Returns a dictionary mapping stat names to lists containing that stat for every schedule in `schedules` (lists of sections).
+
+        The stats are "earliest" and "latest" (the earliest/latest time of day of any meeting, or None if there are none), "instructors" (a sorted list of every instructor), "days" (the number of days of the week with classes), "gaps" (the total minutes of gaps between classes in a week), and "headroom" (the fewest open seats in any section, or None if unknown).
+        """
+        rows = list(zip(*(map(self.numbers.__getitem__, column) for column in itertools.zip_longest(*schedules, fillvalue=None)))) # matrix of section numbers, where schedules with fewer sections are padded with the empty section
+        if not rows: rows = [(self.numbers[None],)] * len(schedules)
+        combine = lambda function, values: [function(map(values.__getitem__, row)) for row in rows]
+        combine_masks = lambda masks: [functools.reduce(operator.or_, map(masks.__getitem__, row)) for row in rows]
+
+        instructor_masks = combine_masks(self.instructor_masks)
+        instructor_lists = {mask: [name for index, name in enumerate(self.instructor_names) if mask >> index & 1] for mask in set(instructor_masks)} # many schedules have the same instructors
+        return {
+            "earliest": [None if earliest == "~" else earliest for earliest in combine(min, self.earliest)],
+            "latest": [latest or None for latest in combine(max, self.latest)],
+            "instructors": list(map(instructor_lists.__getitem__, instructor_masks)),
+            "days": [bin(mask).count("1") for mask in combine_masks(self.weekday_masks)],
+            "gaps": [self.get_cached_gaps(meeting_ids) for meeting_ids in combine(tuple, self.meeting_ids)],
+            "headroom": [None if headroom == math.inf else headroom for headroom in combine(min, self.headroom)],
+        }
+
+class ScheduleQuery:
+    """
+    Filters and sort order for schedules, using the stats from the `ScheduleStats` instance `stats`, so that clients only get the schedules they'll show.
+
+    Schedules with more than `max_days` days of classes, more than `max_gaps` minutes of gaps, or fewer than `min_headroom` open seats in any section are left out (None for no limit). If `sort` is one of `SORT_KEYS`, this also works like `SchedulePreferences` for ranking schedules by fewest days, fewest minutes of gaps, or most open seats, respectively.
+    """
+    def __init__(self, stats, max_days=None, max_gaps=None, min_headroom=None, sort=None):
+        assert sort is None or sort in SORT_KEYS
+        self.stats = stats
+        self.max_days, self.max_gaps, self.min_headroom, self.sort = max_days, max_gaps, min_headroom, sort
+        self.max_headroom = max((headroom for headroom in stats.headroom if headroom != math.inf), default=0) # headroom costs are relative to this, so they're never negative
+
+    def accepts(self, sections, complete=True):
+        """Returns whether schedules containing `sections` pass the filters. If `complete` is False, `sections` may only be part of a schedule, and this only returns False if no schedule containing them would pass (see `Scheduler.best`)."""
+        numbers = self.stats.get_numbers(sections)
+        if self.max_days is not None and self.stats.get_days(numbers) > self.max_days: return False # adding sections never reduces the number of days
+        if self.min_headroom is not None:
+            headroom = self.stats.get_headroom(numbers)
+            if headroom is not None and headroom < self.min_headroom: return False # adding sections never adds open seats to the fullest section
+        if complete and self.max_gaps is not None and self.stats.get_gaps(numbers) > self.max_gaps: return False # adding sections can fill in gaps, so only complete schedules are checked
+        return True
+
+    def section_cost(self, section):
+        return 0
+
+    def schedule_cost(self, sections):
+        numbers = self.stats.get_numbers(sections)
+        if self.sort == "days": return self.stats.get_days(numbers)
+        if self.sort == "gaps": return self.stats.get_gaps(numbers)
+        headroom = self.stats.get_headroom(numbers)
+        return 0 if headroom is None else self.max_headroom - headroom
+
+    def schedule_bound(self, sections): # adding sections never reduces the number of days or adds open seats to the fullest section, but can fill in gaps
+        return 0 if self.sort == "gaps" else self.schedule_cost(sections)
+
+def rank_schedules(course_sections, preferences, count, conflict_index=None, deadline=None, schedule_filter=None):
+    """
+    Computes a list of up to `count` valid schedules given a course sections map (see `build_scheduler`), best first according to `preferences`, a `SchedulePreferences` instance or a `ScheduleQuery` with a sort order. If `schedule_filter` is given, only schedules it accepts are included (see `Scheduler.best`).
+
+    Returns a 2-tuple containing the list of schedules and whether the search finished before `deadline` (see `Scheduler.best`).
+    """
+    try:
+        scheduler = build_scheduler(course_sections, collapse_equivalent=False, conflict_index=conflict_index, deadline=deadline) # sections with identical meeting times can still have different costs, like for instructor preferences
+    except DeadlineExceeded:
+        return [], False
+    with metrics.timed("solve"):
+        return scheduler.best(count, preferences.section_cost, preferences.schedule_cost, preferences.schedule_bound, deadline, schedule_filter)
+
+def compute_schedules(course_sections, limit=500):
+    """
+    Computes a list of up to `limit` valid schedules given a course sections map (see `build_scheduler`).
+    """
+    scheduler = build_scheduler(course_sections)
+    with metrics.timed("solve"):
+        schedules = list(itertools.islice(scheduler.solve(), limit))
 
-    possibility_space = 1
-    for sections in requirements.values(): possibility_space *= len(sections)
-    print(len(schedules), "valid schedules found out of", possibility_space, "possibilities")
+    if logger.isEnabledFor(logging.DEBUG):
+        possibility_space = 1
+        for sections in get_requirements(course_sections).values(): possibility_space *= len(sections)
+        logger.debug("%d valid schedules found out of %d possibilities", len(schedules), possibility_space)
 
     return schedules
 
@@ -151,6 +581,10 @@ if __name__ == "__main__":
 
     # test the conflict checker
     import datetime
+    try:  # when used as a module, do relative import
+        from .course_info import SectionTimes
+    except SystemError:  # not being used as a module, do normal import
+        from course_info import SectionTimes
     requirements = {
         ('CS240', 'LEC'): ['LEC 002', 'LEC 003', 'LEC 001'],
         ('ECON201', 'LEC'): ['LEC 002', 'LEC 003', 'LEC 001'],
@@ -171,5 +605,6 @@ if __name__ == "__main__":
         ('CS240', 'TUT 103'): [(datetime.datetime(2015, 1, 5, 15, 30), datetime.datetime(2015, 1, 5, 16, 20))],
         ('ECON201', 'LEC 001'): [(datetime.datetime(2015, 1, 6, 13, 0), datetime.datetime(2015, 1, 6, 14, 20)), (datetime.datetime(2015, 1, 8, 13, 0), datetime.datetime(2015, 1, 8, 14, 20))]
     }
+    course_sections = {section: SectionTimes.from_datetimes(blocks) for section, blocks in course_sections.items()}
     print("Conflicts:")
     print(list(get_conflicts(requirements, course_sections)))
\ No newline at end of file
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import itertools
+import threading
+import multiprocessing
+
+import cachetools
+
+SOLVER_PROCESSES = int(os.environ.get("COURSERATOR_SOLVER_PROCESSES", 2)) # number of processes that solve for schedules, or 0 to solve in the thread handling the request
+SOLVE_TIME_LIMIT = float(os.environ.get("COURSERATOR_SOLVE_TIME_LIMIT", 5)) # seconds a request can spend solving before it gets the schedules found so far
+SOLVE_GRACE_TIME = 1 # extra seconds to wait for a solver process to notice that its deadline has passed
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn" # solver processes are started while other threads are handling requests, and forking then could copy locks those threads are holding into them
+
+try:  # when used as a module, do relative import
+    from . import metrics
+    from . import scheduler
+    from . import term_index
+except SystemError:  # not being used as a module, do normal import
+    import metrics
+    import scheduler
+    import term_index
+
+# solver processes that aren't running a job, started when first needed so that each WSGI worker process gets its own
+idle_processes = []
+idle_processes_lock = threading.Lock()
+solver_slots = threading.BoundedSemaphore(max(SOLVER_PROCESSES, 1)) # limits the number of solver processes running jobs at once
+
+# partially enumerated schedules for recently requested pages, so that the next page continues where the previous one left off (kept in whichever process solved for the previous page)
+schedule_iterators = cachetools.LRUCache(maxsize=100)
+schedule_iterators_lock = threading.Lock()
+
+def find_schedules(term, iterator_key, course_sections, cursor, limit, deadline, schedule_filter=None):
+    """
+    Finds up to `limit` valid schedules for a course sections map (see `scheduler.build_scheduler`), starting after the first `cursor` schedules, and stopping early once `deadline` (in seconds since the epoch) passes. If `schedule_filter` is given, only schedules it accepts are found and counted (see `scheduler.ScheduleQuery.accepts`), so `iterator_key` must identify the filter too.
+
+    Returns a 3-tuple containing the list of schedules, the cursor for the next page (or None if there are no more schedules, or none were found before the deadline), and whether the search finished before the deadline. Enumeration continues where a previous call left off if there was one with the same `iterator_key` that ended at `cursor`.
+    """
+    if time.time() >= deadline: return [], None, False # waited too long to get started
+    with schedule_iterators_lock:
+        schedule_iterator = schedule_iterators.pop(iterator_key + (cursor,), None)
+    skip = 0 # number of schedules to skip before the ones on this page
+    if schedule_iterator is None:
+        try:
+            schedule_iterator, skip = scheduler.build_scheduler(course_sections, conflict_index=term_index.open_term_index(term), deadline=deadline).solve(), cursor
+        except scheduler.DeadlineExceeded:
+            return [], None, False
+
+    schedules, complete = [], True
+    with metrics.timed("solve"):
+        for schedule in schedule_iterator:
+            if schedule_filter is None or schedule_filter(schedule):
+                if skip > 0:
+                    skip -= 1
+                else:
+                    schedules.append(schedule)
+                    if len(schedules) > limit: break # get one more schedule than needed to check whether there's another page
+            if time.time() >= deadline: # checked for every schedule, even ones that are filtered out, so that a filter that rejects everything can't keep the search going
+                complete = False
+                break
+
+    # keep the iterator around for the next page, if there is one
+    next_cursor = None
+    if len(schedules) > limit:
+        next_cursor, schedule_iterator = cursor + limit, itertools.chain(schedules[limit:], schedule_iterator)
+    elif not complete and schedules: # the next page starts right after the schedules found before the deadline (if none were found, asking for the same page again wouldn't get any further)
+        next_cursor = cursor + len(schedules)
+    if next_cursor is not None:
+        with schedule_iterators_lock:
+            schedule_iterators[iterator_key + (next_cursor,)] = schedule_iterator
+    return schedules[:limit], next_cursor, complete
+
+def rank_schedules(term, course_sections, preferences, count, deadline, schedule_filter=None):
+    """Same as `scheduler.rank_schedules`, using the term index for the term code `term` if there is one."""
+    if time.time() >= deadline: return [], False # waited too long to get started
+    return scheduler.rank_schedules(course_sections, preferences, count, term_index.open_term_index(term), deadline, schedule_filter)
+
+class SolverProcess:
+    """A process that runs one job at a time for `run`, receiving each job and sending back its result over a pipe of its own, so that it can be terminated without affecting any other job."""
+    def __init__(self):
+        context = multiprocessing.get_context(START_METHOD)
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=serve, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def call(self, function, args, timeout):
+        """Calls `function` with the arguments `args` in this process, returning a 3-tuple containing whether it returned normally, its result or the exception it raised, and the stage timings it recorded, or None if that takes longer than `timeout` seconds."""
+        self.connection.send((function, args))
+        if not self.connection.poll(timeout): return None
+        return self.connection.recv()
+
+    def terminate(self):
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+def serve(connection):
+    """Runs the jobs received over `connection` in a solver process, until the other end is closed (see `SolverProcess`)."""
+    while True:
+        try:
+            function, args = connection.recv()
+        except EOFError:
+            return
+        metrics.start_request()
+        try:
+            returned, result = True, function(*args)
+        except Exception as e:
+            returned, result = False, e
+        connection.send((returned, result, metrics.finish_request()))
+
+def run(function, args, deadline, timeout_result):
+    """
+    Calls `function` (`find_schedules` or `rank_schedules`) with the arguments `args` in a solver process, and returns its result.
+
+    If no solver process is free before `deadline` (in seconds since the epoch), or the result isn't available shortly after it, this gives up and returns `timeout_result` instead. A solver process that's still busy by then (like one stuck in a long Pycosat call) is terminated, and replaced the next time one is needed.
+    """
+    if SOLVER_PROCESSES <= 0: return function(*args)
+    if not solver_slots.acquire(timeout=max(deadline - time.time(), 0)): return timeout_result
+    try:
+        with idle_processes_lock:
+            process = idle_processes.pop() if idle_processes else None
+        if process is None: process = SolverProcess()
+        try:
+            response = process.call(function, args, max(deadline - time.time(), 0) + SOLVE_GRACE_TIME)
+        except (EOFError, OSError): # the solver process died
+            process.terminate()
+            raise
+        if response is None:
+            process.terminate()
+            return timeout_result
+        with idle_processes_lock:
+            idle_processes.append(process)
+    finally:
+        solver_slots.release()
+    returned, result, stages = response
+    metrics.record_stages(stages)
+    if not returned: raise result
+    return result
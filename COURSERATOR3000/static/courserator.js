@@ -1,4 +1,6 @@
 var CURRENT_DATA = null;
+var CURRENT_URL = null;
+var CURRENT_PARAMETERS = null;
 
 var escapeHTML = (function () {
 	var replacements = { "\"": "&quot;", "&": "&amp;", "<": "&lt;", ">": "&gt;" };
@@ -7,6 +9,52 @@ var escapeHTML = (function () {
 	};
 }());
 
+var BLOCK_FORMAT = "YYYY-MM-DD[T]HH:mm:ss"; // same format as the times in responses, without time zone offsets
+
+function expandPatterns(patterns) { // obtain every meeting from a list of weekly meeting patterns, in the same order as the server would list them
+	var blocks = [];
+	for (var i = 0; i < patterns.length; i ++) {
+		var pattern = patterns[i]; // weekday, start minute, end minute, start date, end date (exclusive)
+		var day = moment.utc(pattern[3]), endDate = moment.utc(pattern[4]);
+		day.add((pattern[0] - (day.isoWeekday() - 1) + 7) % 7, "days"); // move to the first matching weekday
+		for (; day.isBefore(endDate); day.add(7, "days"))
+			blocks.push([day.clone().add(pattern[1], "minutes").format(BLOCK_FORMAT), day.clone().add(pattern[2], "minutes").format(BLOCK_FORMAT)]);
+	}
+	return blocks.sort(function(a, b) { return a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : a[1] < b[1] ? -1 : a[1] > b[1] ? 1 : 0; });
+}
+
+function decodeResponse(data) { // convert a response in the compact format into the regular format
+	if (data.format !== "compact") return data;
+	var keys = [], sections = {};
+	for (var i = 0; i < data.sections.length; i ++) {
+		var section = data.sections[i];
+		if (section.patterns !== null) section.blocks = expandPatterns(section.patterns);
+		else section.blocks = section.blocks.map(function(block) { return [moment.utc(block[0] * 60000).format(BLOCK_FORMAT), moment.utc(block[1] * 60000).format(BLOCK_FORMAT)]; });
+		delete section.patterns;
+		keys.push(section.name + "|" + section.section);
+		sections[keys[i]] = section;
+	}
+	var schedules = [], scheduleStats = [];
+	for (var i = 0; i < data.schedules.length; i ++) {
+		var schedule = [], earliest = null, latest = null, instructors = {};
+		for (var j = 0; j < data.schedules[i].length; j ++) {
+			var section = data.sections[data.schedules[i][j]];
+			schedule.push(keys[data.schedules[i][j]]);
+			if (section.earliest !== null && (earliest === null || section.earliest < earliest)) earliest = section.earliest;
+			if (section.latest !== null && (latest === null || section.latest > latest)) latest = section.latest;
+			for (var k = 0; k < section.instructors.length; k ++) instructors[section.instructors[k]] = true;
+		}
+		schedules.push(schedule);
+		var stats = { earliest: earliest === null ? "-" : earliest, latest: latest === null ? "-" : latest, instructors: Object.keys(instructors).sort() };
+		for (var name in data.schedule_stats) { // the stats that the server computed
+			var value = data.schedule_stats[name][i];
+			stats[name] = value === null ? "-" : value;
+		}
+		scheduleStats.push(stats);
+	}
+	return { sections: sections, schedules: schedules, schedule_stats: scheduleStats, failed_courses: data.failed_courses, next_cursor: data.next_cursor, partial: data.partial };
+}
+
 function showJSON() {
 	var win = window.open("about:blank", null, "width=400,height=300");
 	var doc = win.document;
@@ -87,8 +135,11 @@ function tableShowScheduleList(scheduleStats) {
 	var columns = [
 		{ data: "earliest", width: "auto" },
 		{ data: "latest", width: "auto" },
+		{ data: "days", width: "auto" },
+		{ data: "gaps", width: "auto" },
+		{ data: "headroom", width: "auto" },
 	];
-	$("#scheduleList thead th:gt(1)").remove(); // remove every column past the second
+	$("#scheduleList thead th:gt(4)").remove(); // remove every column past the fifth
 	var headerRow = $("#scheduleList thead tr");
 	for (var i = 0; i < instructors.length; i ++) {
 		columns.push({ data: "instructor" + i, width: "auto" });
@@ -102,6 +153,9 @@ function tableShowScheduleList(scheduleStats) {
 		var newStat = {
 			earliest: schedule.earliest,
 			latest: schedule.latest,
+			days: schedule.days,
+			gaps: schedule.gaps,
+			headroom: schedule.headroom,
 		};
 		for (var j = 0; j < instructors.length; j ++)
 			newStat["instructor" + j] = schedule.instructors.indexOf(instructors[j]) != -1 ? "yep" : "-";
@@ -111,6 +165,7 @@ function tableShowScheduleList(scheduleStats) {
 	table.DataTable({
 		data: newStats,
 		columns: columns,
+		order: [], // keep the order from the server, which sorts schedules if asked to
 		paging: false,
 		scrollY: 400,
 		oLanguage: { sEmptyTable: function() { return "No schedules available - make a new search!"; } },
@@ -138,13 +193,29 @@ function querySearchCourses(event) {
 	
 	var term = $("#term").val();
 	var resultURL = "schedules/" + term + "/" + $("#query").val();
+	var parameters = { format: "compact" };
+	if ($("#rank").prop("checked")) { // rank schedules by preferences
+		parameters.rank = 1;
+		if ($("#earliest").val() !== "") parameters.earliest = $("#earliest").val();
+	}
+	if ($("#sort").val() !== "") parameters.sort = $("#sort").val(); // sort and filter schedules on the server, so only the ones that will be shown are sent
+	if ($("#maxDays").val() !== "") parameters.max_days = $("#maxDays").val();
+	if ($("#openOnly").prop("checked")) parameters.min_headroom = 1;
 	$("#progress").show();
-	$.get(resultURL, function(data) {
+	$("#loadMore").hide();
+	$.get(resultURL, parameters, function(data) {
 		$("#progress").hide();
-		if (data.schedules.length === 0) { alert("jdn pls"); return; }
+		data = decodeResponse(data);
+		var failedCourses = Object.keys(data.failed_courses);
+		if (failedCourses.length !== 0) alert("Couldn't load " + failedCourses.join(", ") + " - try again later!");
+		if (data.partial) alert(data.schedules.length === 0 ? "Took too long to find any schedules - try again or try fewer courses!" : "Took too long to find every schedule - showing the ones found so far.");
+		if (data.schedules.length === 0) { if (!data.partial && failedCourses.length === 0) alert("jdn pls"); return; }
 		console.log(data);
 		CURRENT_DATA = data;
+		CURRENT_URL = resultURL;
+		CURRENT_PARAMETERS = parameters;
 		tableShowScheduleList(data.schedule_stats);
+		$("#loadMore").toggle(data.next_cursor !== null);
 		
 		var table = $("#scheduleList");
 		table.find("tr:nth-child(1)").addClass("selected"); // select the second row (first row is headers)
@@ -152,6 +223,22 @@ function querySearchCourses(event) {
 	}, "json");
 }
 
+function queryLoadMore() { // append the next page of schedules to the current results
+	if (CURRENT_DATA === null || CURRENT_DATA.next_cursor === null) return;
+	$("#progress").show();
+	$.get(CURRENT_URL, $.extend({ cursor: CURRENT_DATA.next_cursor }, CURRENT_PARAMETERS), function(data) {
+		$("#progress").hide();
+		data = decodeResponse(data);
+		if (data.partial) alert("Took too long to find the next schedules - showing the ones found so far.");
+		$.extend(CURRENT_DATA.sections, data.sections);
+		CURRENT_DATA.schedules = CURRENT_DATA.schedules.concat(data.schedules);
+		CURRENT_DATA.schedule_stats = CURRENT_DATA.schedule_stats.concat(data.schedule_stats);
+		CURRENT_DATA.next_cursor = data.next_cursor;
+		tableShowScheduleList(CURRENT_DATA.schedule_stats);
+		$("#loadMore").toggle(data.next_cursor !== null);
+	}, "json");
+}
+
 $(document).ready(function() {
 	$("#courses").submit(querySearchCourses);
 	$("#query").on("input", queryValidateCourses);
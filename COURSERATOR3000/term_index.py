@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import json
+import mmap
+import struct
+import threading
+import time
+from array import array
+from datetime import datetime
+
+INDEX_DIRECTORY = os.environ.get("COURSERATOR_INDEX_DIR", "") # directory containing term index files built by `build_index`, or an empty string to always use the API
+INDEX_MAGIC = b"CRTRIDX1"
+
+try:  # when used as a module, do relative import
+    from . import course_info
+    from . import scheduler
+    from .uwapi import uwapi
+except SystemError:  # not being used as a module, do normal import
+    import course_info
+    import scheduler
+    from uwapi import uwapi
+
+def get_subject(course):
+    """Returns the subject of a course name like "CS240"."""
+    return re.match(r"^([a-zA-Z]+)", course).group(1)
+
+def download_term(term):
+    """Returns a dictionary mapping course names to schedule data (like `course_info.get_courses_data`) for every course offered in the term code `term`."""
+    subjects = sorted({entry["subject"] for entry in uwapi("codes/subjects")})
+    pending = [(subject, course_info.executor.submit(uwapi, "terms/{term}/{subject}/schedule".format(term=term, subject=subject))) for subject in subjects]
+    courses_data = {}
+    for subject, future in pending:
+        try:
+            sections = future.result()
+        except Exception as e: # some subjects have nothing scheduled this term
+            print("skipping subject {}: {}".format(subject, str(e) or type(e).__name__), file=sys.stderr)
+            continue
+        for section in sections:
+            courses_data.setdefault(section["subject"] + section["catalog_number"], []).append(section)
+    return courses_data
+
+def build_index(path, term, courses_data, term_start, term_end):
+    """
+    Writes an index file to `path` for the term code `term`, containing every course in `courses_data` (see `course_info.get_courses_data`).
+
+    The index file contains a header with the magic bytes and the length of the JSON metadata, the JSON metadata itself, the start times and then end times of every section's meetings as 64-bit integers (see `course_info.SectionTimes`), and a conflict bit matrix for every subject. Bit $i n + j$ of a subject's bit matrix is set if the $i$-th and $j$-th of its $n$ sections conflict.
+
+    The file is written to a temporary file first and then moved into place, so processes that have the old index open are unaffected.
+    """
+    course_sections = course_info.get_courses_sections(courses_data, term_start, term_end)
+
+    # lay out the meeting times of every section in one pair of arrays
+    starts, ends = array("q"), array("q")
+    courses = {}
+    subject_sections = {} # mapping from subjects to the course sections maps for their courses
+    for course, course_data in sorted(courses_data.items()):
+        sections = []
+        for section_entry in course_data:
+            section = (course, section_entry["section"])
+            section_times = course_sections[section]
+            patterns = None if section_times.patterns is None else [
+                [weekday, start_minute, end_minute, course_info.to_minutes(start_date), course_info.to_minutes(end_date)]
+                for weekday, start_minute, end_minute, start_date, end_date in section_times.patterns
+            ]
+            sections.append([section[1], len(starts), len(section_times), patterns])
+            starts.extend(section_times.starts)
+            ends.extend(section_times.ends)
+            subject_sections.setdefault(get_subject(course), {})[section] = section_times
+        courses[course] = {"entries": course_data, "sections": sections}
+
+    # compute conflicts between every pair of sections within each subject
+    subjects = {}
+    bit_matrices = bytearray()
+    for subject, sections in sorted(subject_sections.items()):
+        section_list = sorted(sections)
+        positions = {section: index for index, section in enumerate(section_list)}
+        bit_matrix = bytearray((len(section_list) ** 2 + 7) // 8)
+        for section1, section2 in scheduler.get_conflicts(scheduler.get_requirements(sections), sections):
+            for bit in (positions[section1] * len(section_list) + positions[section2], positions[section2] * len(section_list) + positions[section1]):
+                bit_matrix[bit // 8] |= 1 << (bit % 8)
+        subjects[subject] = {"sections": section_list, "offset": len(bit_matrices)}
+        bit_matrices += bit_matrix
+
+    metadata = json.dumps({
+        "term": term,
+        "term_start": course_info.to_minutes(term_start),
+        "term_end": course_info.to_minutes(term_end),
+        "updated": time.time(),
+        "byteorder": sys.byteorder,
+        "block_count": len(starts),
+        "courses": courses,
+        "subjects": subjects,
+    }).encode("utf-8")
+    metadata += b" " * (-(16 + len(metadata)) % 8) # pad so that the arrays are aligned to 8 bytes
+
+    temporary_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temporary_path, "wb") as f:
+        f.write(struct.pack("<8sQ", INDEX_MAGIC, len(metadata)))
+        f.write(metadata)
+        starts.tofile(f)
+        ends.tofile(f)
+        f.write(bit_matrices)
+    os.replace(temporary_path, path)
+
+class TermIndex:
+    """
+    Read-only index of every course in a term, built ahead of time by `build_index`.
+
+    The meeting times and conflict bit matrices are memory-mapped from the index file, so they're shared between every process that opens the same file, and nothing has to be fetched from the API or parsed for each request.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mtime = os.fstat(f.fileno()).st_mtime
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, metadata_length = struct.unpack_from("<8sQ", self.mapping, 0)
+        assert magic == INDEX_MAGIC, "not a term index file: {}".format(path)
+        metadata = json.loads(self.mapping[16:16 + metadata_length].decode("utf-8"))
+        assert metadata["byteorder"] == sys.byteorder, "term index was built on a machine with a different byte order"
+
+        self.term, self.updated = metadata["term"], metadata["updated"]
+        self.term_start, self.term_end = course_info.from_minutes(metadata["term_start"]), course_info.from_minutes(metadata["term_end"])
+        self.courses, self.subjects = metadata["courses"], metadata["subjects"]
+        self.positions = {subject: {tuple(section): index for index, section in enumerate(entry["sections"])} for subject, entry in self.subjects.items()}
+
+        view = memoryview(self.mapping)
+        data_offset, block_count = 16 + metadata_length, metadata["block_count"]
+        self.starts = view[data_offset:data_offset + 8 * block_count].cast("q")
+        self.ends = view[data_offset + 8 * block_count:data_offset + 16 * block_count].cast("q")
+        self.bit_matrices = view[data_offset + 16 * block_count:]
+
+    def get_courses_data(self, course_list):
+        """Returns the same 2-tuple as `course_info.get_courses_data`, but with the data from the index."""
+        result = {course: self.courses[course]["entries"] for course in course_list if course in self.courses}
+        errors = {course: "Not offered in this term" for course in course_list if course not in self.courses}
+        return result, errors
+
+    def get_courses_sections(self, course_list):
+        """Returns the same course sections map as `course_info.get_courses_sections`, but with the meeting times from the index."""
+        result = {}
+        for course in course_list:
+            if course not in self.courses: continue
+            for section_name, offset, length, patterns in self.courses[course]["sections"]:
+                if patterns is not None:
+                    patterns = [(weekday, start_minute, end_minute, course_info.from_minutes(start_date), course_info.from_minutes(end_date)) for weekday, start_minute, end_minute, start_date, end_date in patterns]
+                result[(course, section_name)] = course_info.SectionTimes.from_arrays(self.starts[offset:offset + length], self.ends[offset:offset + length], patterns)
+        return result
+
+    def get_course_conflicts(self, course1, course2, requirements):
+        """
+        Returns a list of 2-tuples containing the names of conflicting sections of `course1` and `course2` in different requirements in `requirements`, or None if the index doesn't cover that pair of courses.
+
+        Only pairs of courses in the same subject are covered. This is meant to be used with `scheduler.get_cached_conflicts`, on course sections from `get_courses_sections`.
+        """
+        subject = get_subject(course1)
+        if course1 not in self.courses or course2 not in self.courses or get_subject(course2) != subject: return None
+        positions, offset = self.positions[subject], self.subjects[subject]["offset"]
+        sections1 = [(name, (course1, section_name)) for name, section_names in requirements.items() if name[0] == course1 for section_name in section_names]
+        sections2 = [(name, (course2, section_name)) for name, section_names in requirements.items() if name[0] == course2 for section_name in section_names]
+        result = []
+        for index1, (name1, section1) in enumerate(sections1):
+            for index2, (name2, section2) in enumerate(sections2):
+                if name1 == name2 or (course1 == course2 and index2 <= index1): continue # sections of the same requirement don't conflict, and each pair within a course is only checked once
+                bit = positions[section1] * len(positions) + positions[section2]
+                if self.bit_matrices[offset + bit // 8] & (1 << (bit % 8)):
+                    result.append((section1[1], section2[1]))
+        return result
+
+open_indexes = {} # mapping from term codes to the `TermIndex` instances open in this process
+open_indexes_lock = threading.Lock()
+
+def open_term_index(term):
+    """Returns the `TermIndex` for the term code `term` from `INDEX_DIRECTORY`, or None if there is no index for that term. The index is reopened if its file was replaced."""
+    if not INDEX_DIRECTORY: return None
+    path = os.path.join(INDEX_DIRECTORY, "{}.index".format(term))
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    with open_indexes_lock:
+        index = open_indexes.get(term)
+        if index is None or index.mtime != mtime:
+            index = open_indexes[term] = TermIndex(path)
+        return index
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Build an index of every course in a term, so that the server doesn't need to use the API for that term.")
+    parser.add_argument("term", help="term code, like 1151")
+    parser.add_argument("--json", help="load the courses from a JSON file mapping course names to schedule data, instead of downloading them")
+    parser.add_argument("--test-data", action="store_true", help="load the courses from `test_data.courses_data`, instead of downloading them")
+    parser.add_argument("--start", help="date lectures start, like 2015-01-05 (fetched from the API by default)")
+    parser.add_argument("--end", help="date lectures end, like 2015-04-06 (fetched from the API by default)")
+    parser.add_argument("--output", default=INDEX_DIRECTORY or ".", help="directory to write the index file to (default: $COURSERATOR_INDEX_DIR or the current directory)")
+    args = parser.parse_args()
+
+    if args.json:
+        with open(args.json) as f:
+            courses_data = json.load(f)
+    elif args.test_data:
+        try:  # when used as a module, do relative import
+            from .test_data import courses_data
+        except SystemError:  # not being used as a module, do normal import
+            from test_data import courses_data
+    else:
+        courses_data = download_term(args.term)
+    if args.start and args.end:
+        term_start, term_end = datetime.strptime(args.start, "%Y-%m-%d"), datetime.strptime(args.end, "%Y-%m-%d")
+    else:
+        term_start, term_end = course_info.get_term_start_end_dates(args.term)
+
+    path = os.path.join(args.output, "{}.index".format(args.term))
+    build_index(path, args.term, courses_data, term_start, term_end)
+    print("indexed {} courses into {} ({} bytes)".format(len(courses_data), path, os.path.getsize(path)))
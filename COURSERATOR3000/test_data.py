@@ -1 +1,33 @@
 courses_data = {'CS240': [{'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '13:00', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '14:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4021'}, 'instructors': ['Lopez-Ortiz,Alejandro']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': '201', 'academic_level': 'undergraduate', 'enrollment_total': 94, 'section': 'LEC 001', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 94, 'class_number': 5764, 'associated_class': 1, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '11:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '12:50', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4061'}, 'instructors': ['Biedl,Therese']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': '201', 'academic_level': 'undergraduate', 'enrollment_total': 98, 'section': 'LEC 002', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 94, 'class_number': 6055, 'associated_class': 2, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '11:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '12:50', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4064'}, 'instructors': ['Lopez-Ortiz,Alejandro']}], 'related_component_1': '105', 'units': 0.5, 'related_component_2': '201', 'academic_level': 'undergraduate', 'enrollment_total': 34, 'section': 'LEC 003', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 34, 'class_number': 6242, 'associated_class': 3, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': None, 'end_time': '14:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4060'}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 55, 'section': 'TUT 101', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 55, 'class_number': 6191, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '14:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': None, 'end_time': '15:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4058'}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 54, 'section': 'TUT 102', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 55, 'class_number': 6192, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '15:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': None, 'end_time': '16:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4040'}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 41, 'section': 'TUT 103', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 55, 'class_number': 6193, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '16:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': None, 'end_time': '17:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4042'}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 42, 'section': 'TUT 104', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 55, 'class_number': 6194, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '15:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': None, 'end_time': '16:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4064'}, 'instructors': []}], 'related_component_1': None, 'units': 0.5, 'related_component_2': '201', 'academic_level': 'undergraduate', 'enrollment_total': 34, 'section': 'TUT 105', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 40, 'class_number': 7713, 'associated_class': 3, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '16:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'Th', 'start_date': '02/26', 'end_time': '18:20', 'end_date': '02/26', 'is_closed': False}, 'location': {'building': None, 'room': None}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 226, 'section': 'TST 201', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Data Structures and Data Management', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '240', 'note': 'Choose TUT for Related 1. LEC 003 is auto-enrolled.', 'enrollment_capacity': 260, 'class_number': 5861, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}], 'ECON201': [{'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '13:00', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '14:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '2054'}, 'instructors': ['Nimubona,Alain-Desire']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 95, 'section': 'LEC 001', 'last_updated': '2014-11-28T22:11:45-05:00', 'title': 'Microeconomic Theory 1', 'campus': 'UW U', 'held_with': [], 'reserves': [{'enrollment_capacity': 5, 'reserve_group': 'ECON majors students ', 'enrollment_total': 5}, {'enrollment_capacity': 15, 'reserve_group': 'Arts Students ', 'enrollment_total': 14}], 'catalog_number': '201', 'note': None, 'enrollment_capacity': 100, 'class_number': 3313, 'associated_class': 1, 'topic': None, 'subject': 'ECON', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '11:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'MW', 'start_date': None, 'end_time': '12:50', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '2017'}, 'instructors': []}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 62, 'section': 'LEC 002', 'last_updated': '2014-11-28T22:11:45-05:00', 'title': 'Microeconomic Theory 1', 'campus': 'UW U', 'held_with': [], 'reserves': [{'enrollment_capacity': 15, 'reserve_group': 'Arts Students ', 'enrollment_total': 15}], 'catalog_number': '201', 'note': None, 'enrollment_capacity': 100, 'class_number': 3314, 'associated_class': 2, 'topic': None, 'subject': 'ECON', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '14:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '15:50', 'end_date': None, 'is_closed': False}, 'location': {'building': 'RCH', 'room': '211'}, 'instructors': ['Van de Waal,Cornelis Howard']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 100, 'section': 'LEC 003', 'last_updated': '2014-11-28T22:11:45-05:00', 'title': 'Microeconomic Theory 1', 'campus': 'UW U', 'held_with': [], 'reserves': [{'enrollment_capacity': 8, 'reserve_group': 'ECON majors students ', 'enrollment_total': 8}, {'enrollment_capacity': 15, 'reserve_group': 'Arts Students ', 'enrollment_total': 16}], 'catalog_number': '201', 'note': None, 'enrollment_capacity': 100, 'class_number': 3876, 'associated_class': 3, 'topic': None, 'subject': 'ECON', 'term': 1151}], 'SCI267': [{'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '11:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'WF', 'start_date': None, 'end_time': '12:50', 'end_date': None, 'is_closed': False}, 'location': {'building': 'HH', 'room': '1102'}, 'instructors': ['Fraser,Doreen']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 15, 'section': 'LEC 001', 'last_updated': '2014-11-28T22:15:06-05:00', 'title': 'Introduction to the Philosophy of Science', 'campus': 'UW U', 'held_with': ['PHIL 258'], 'reserves': [], 'catalog_number': '267', 'note': None, 'enrollment_capacity': 25, 'class_number': 6512, 'associated_class': 1, 'topic': None, 'subject': 'SCI', 'term': 1151}], 'ECE124': [{'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '14:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'RCH', 'room': '302'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '12:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': None, 'end_time': '13:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'RCH', 'room': '301'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '16:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '01/20', 'end_time': '17:20', 'end_date': '01/20', 'is_closed': False}, 'location': {'building': 'RCH', 'room': '302'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '16:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '02/03', 'end_time': '17:20', 'end_date': '02/03', 'is_closed': False}, 'location': {'building': 'RCH', 'room': '302'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '16:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '03/03', 'end_time': '17:20', 'end_date': '03/03', 'is_closed': False}, 'location': {'building': 'RCH', 'room': '302'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '16:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '03/17', 'end_time': '17:20', 'end_date': '03/17', 'is_closed': False}, 'location': {'building': 'RCH', 'room': '302'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '16:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '03/31', 'end_time': '17:20', 'end_date': '03/31', 'is_closed': False}, 'location': {'building': 'RCH', 'room': '302'}, 'instructors': ['Kennings,Andrew']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 146, 'section': 'LEC 001', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [{'enrollment_capacity': 159, 'reserve_group': 'COMPE or ELE Yr 1 students ', 'enrollment_total': 145}], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 159, 'class_number': 4949, 'associated_class': 1, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '09:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'MWF', 'start_date': None, 'end_time': '10:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '1085'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '01/13', 'end_time': '09:50', 'end_date': '01/13', 'is_closed': False}, 'location': {'building': 'DC', 'room': '1351'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '01/27', 'end_time': '09:50', 'end_date': '01/27', 'is_closed': False}, 'location': {'building': 'DC', 'room': '1351'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '02/10', 'end_time': '09:50', 'end_date': '02/10', 'is_closed': False}, 'location': {'building': 'DC', 'room': '1351'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '03/10', 'end_time': '09:50', 'end_date': '03/10', 'is_closed': False}, 'location': {'building': 'DC', 'room': '1351'}, 'instructors': ['Kennings,Andrew']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '03/24', 'end_time': '09:50', 'end_date': '03/24', 'is_closed': False}, 'location': {'building': 'DC', 'room': '1351'}, 'instructors': ['Kennings,Andrew']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 136, 'section': 'LEC 002', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [{'enrollment_capacity': 154, 'reserve_group': 'Software Eng Yr 1 students ', 'enrollment_total': 133}], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 154, 'class_number': 5034, 'associated_class': 2, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '10:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'Th', 'start_date': None, 'end_time': '11:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4058'}, 'instructors': ['Kennings,Andrew']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 53, 'section': 'TUT 101', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 53, 'class_number': 4950, 'associated_class': 1, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '14:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': None, 'end_time': '15:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4060'}, 'instructors': ['Kennings,Andrew']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 51, 'section': 'TUT 102', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 53, 'class_number': 4951, 'associated_class': 1, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '10:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': None, 'end_time': '11:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4058'}, 'instructors': ['Kennings,Andrew']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 42, 'section': 'TUT 103', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 53, 'class_number': 4952, 'associated_class': 1, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '12:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': None, 'end_time': '13:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4040'}, 'instructors': ['Kennings,Andrew']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 48, 'section': 'TUT 104', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 51, 'class_number': 5035, 'associated_class': 2, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '12:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'Th', 'start_date': None, 'end_time': '13:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4040'}, 'instructors': ['Kennings,Andrew']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 43, 'section': 'TUT 105', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 52, 'class_number': 5036, 'associated_class': 2, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '15:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': None, 'end_time': '16:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4058'}, 'instructors': ['Kennings,Andrew']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 45, 'section': 'TUT 106', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 51, 'class_number': 5037, 'associated_class': 2, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '01/16', 'end_time': '11:20', 'end_date': '01/16', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '01/30', 'end_time': '11:20', 'end_date': '01/30', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '02/13', 'end_time': '11:20', 'end_date': '02/13', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '03/06', 'end_time': '11:20', 'end_date': '03/06', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '03/20', 'end_time': '11:20', 'end_date': '03/20', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '04/03', 'end_time': '11:20', 'end_date': '04/03', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 52, 'section': 'LAB 201', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 53, 'class_number': 4953, 'associated_class': 1, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '01/12', 'end_time': '11:20', 'end_date': '01/12', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '01/26', 'end_time': '11:20', 'end_date': '01/26', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '02/09', 'end_time': '11:20', 'end_date': '02/09', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '03/02', 'end_time': '11:20', 'end_date': '03/02', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '03/16', 'end_time': '11:20', 'end_date': '03/16', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '03/30', 'end_time': '11:20', 'end_date': '03/30', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 49, 'section': 'LAB 202', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 53, 'class_number': 4954, 'associated_class': 1, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '01/14', 'end_time': '11:20', 'end_date': '01/14', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '01/28', 'end_time': '11:20', 'end_date': '01/28', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '02/11', 'end_time': '11:20', 'end_date': '02/11', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '03/04', 'end_time': '11:20', 'end_date': '03/04', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '03/18', 'end_time': '11:20', 'end_date': '03/18', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '08:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '04/01', 'end_time': '11:20', 'end_date': '04/01', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 45, 'section': 'LAB 203', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 53, 'class_number': 4955, 'associated_class': 1, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '01/16', 'end_time': '16:20', 'end_date': '01/16', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '01/30', 'end_time': '16:20', 'end_date': '01/30', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '02/13', 'end_time': '16:20', 'end_date': '02/13', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '03/06', 'end_time': '16:20', 'end_date': '03/06', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '03/20', 'end_time': '16:20', 'end_date': '03/20', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': '04/03', 'end_time': '16:20', 'end_date': '04/03', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 38, 'section': 'LAB 204', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 51, 'class_number': 5038, 'associated_class': 2, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '01/12', 'end_time': '16:20', 'end_date': '01/12', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '01/26', 'end_time': '16:20', 'end_date': '01/26', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '02/09', 'end_time': '16:20', 'end_date': '02/09', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '03/02', 'end_time': '16:20', 'end_date': '03/02', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '03/16', 'end_time': '16:20', 'end_date': '03/16', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'M', 'start_date': '03/30', 'end_time': '16:20', 'end_date': '03/30', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 49, 'section': 'LAB 205', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 52, 'class_number': 5039, 'associated_class': 2, 'topic': None, 'subject': 'ECE', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '01/14', 'end_time': '16:20', 'end_date': '01/14', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '01/28', 'end_time': '16:20', 'end_date': '01/28', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '02/11', 'end_time': '16:20', 'end_date': '02/11', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '03/04', 'end_time': '16:20', 'end_date': '03/04', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '03/18', 'end_time': '16:20', 'end_date': '03/18', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}, {'date': {'start_time': '13:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'W', 'start_date': '04/01', 'end_time': '16:20', 'end_date': '04/01', 'is_closed': False}, 'location': {'building': 'E2', 'room': '2356'}, 'instructors': ['Jlassi,Bahaedinne']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 49, 'section': 'LAB 206', 'last_updated': '2014-11-28T22:11:34-05:00', 'title': 'Digital Circuits and Systems', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '124', 'note': 'Choose TUT and LAB sections with same Associated Class number as primary meet.', 'enrollment_capacity': 51, 'class_number': 5040, 'associated_class': 2, 'topic': None, 'subject': 'ECE', 'term': 1151}], 'CS241': [{'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '10:00', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '11:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '1056'}, 'instructors': ['Lushman,Bradley Michael']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': '201', 'academic_level': 'undergraduate', 'enrollment_total': 73, 'section': 'LEC 001', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Foundations of Sequential Programs', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '241', 'note': 'Choose TUT section for Related 1.', 'enrollment_capacity': 68, 'class_number': 5765, 'associated_class': 1, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '14:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '15:50', 'end_date': None, 'is_closed': False}, 'location': {'building': 'PHY', 'room': '313'}, 'instructors': ['Lushman,Bradley Michael']}], 'related_component_1': None, 'units': 0.5, 'related_component_2': '201', 'academic_level': 'undergraduate', 'enrollment_total': 69, 'section': 'LEC 002', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Foundations of Sequential Programs', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '241', 'note': 'Choose TUT section for Related 1.', 'enrollment_capacity': 68, 'class_number': 5960, 'associated_class': 2, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '10:00', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'TTh', 'start_date': None, 'end_time': '11:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '2035'}, 'instructors': []}], 'related_component_1': None, 'units': 0.5, 'related_component_2': '201', 'academic_level': 'undergraduate', 'enrollment_total': 69, 'section': 'LEC 003', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Foundations of Sequential Programs', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '241', 'note': 'Choose TUT section for Related 1.', 'enrollment_capacity': 68, 'class_number': 6243, 'associated_class': 3, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '11:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': None, 'end_time': '12:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4040'}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 60, 'section': 'TUT 101', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Foundations of Sequential Programs', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '241', 'note': 'Choose TUT section for Related 1.', 'enrollment_capacity': 60, 'class_number': 5766, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '12:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': None, 'end_time': '13:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4058'}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 51, 'section': 'TUT 102', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Foundations of Sequential Programs', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '241', 'note': 'Choose TUT section for Related 1.', 'enrollment_capacity': 60, 'class_number': 5767, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '14:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': None, 'end_time': '15:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4040'}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 45, 'section': 'TUT 103', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Foundations of Sequential Programs', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '241', 'note': 'Choose TUT section for Related 1.', 'enrollment_capacity': 60, 'class_number': 5961, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '09:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'F', 'start_date': None, 'end_time': '10:20', 'end_date': None, 'is_closed': False}, 'location': {'building': 'MC', 'room': '4063'}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 55, 'section': 'TUT 104', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Foundations of Sequential Programs', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '241', 'note': 'Choose TUT section for Related 1.', 'enrollment_capacity': 60, 'class_number': 6196, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}, {'waiting_capacity': 0, 'waiting_total': 0, 'classes': [{'date': {'start_time': '16:30', 'is_cancelled': False, 'is_tba': False, 'weekdays': 'T', 'start_date': '03/03', 'end_time': '18:20', 'end_date': '03/03', 'is_closed': False}, 'location': {'building': None, 'room': None}, 'instructors': []}], 'related_component_1': '99', 'units': 0.5, 'related_component_2': None, 'academic_level': 'undergraduate', 'enrollment_total': 211, 'section': 'TST 201', 'last_updated': '2014-11-28T22:11:06-05:00', 'title': 'Foundations of Sequential Programs', 'campus': 'UW U', 'held_with': [], 'reserves': [], 'catalog_number': '241', 'note': 'Choose TUT section for Related 1.', 'enrollment_capacity': 240, 'class_number': 5862, 'associated_class': 99, 'topic': None, 'subject': 'CS', 'term': 1151}]}
+
+# recorded response of the `terms/1151/importantdates` endpoint, trimmed to the lecture start and end dates
+important_dates = [{'title': 'Classes begin (uWaterloo)', 'start_date': '2015-01-05', 'end_date': None, 'term': 1151}, {'title': 'Classes end', 'start_date': '2015-04-06', 'end_date': None, 'term': 1151}]
+
+def get_synthetic_courses_data(course_count, section_count, seed=0):
+    """
+    Returns a dictionary mapping course names to schedule data (like `courses_data`) for `course_count` synthetic courses with `section_count` sections each.
+
+    Each synthetic course is a copy of one of the recorded courses, with its sections repeated and every class shifted by a random whole number of hours, so the courses have realistic meeting patterns and conflicts at any size.
+    """
+    import copy, random
+    rng = random.Random(seed)
+    templates = [courses_data[course] for course in sorted(courses_data)]
+    result = {}
+    for course_index in range(course_count):
+        template, catalog_number = templates[course_index % len(templates)], str(100 + course_index)
+        sections = []
+        for section_index in range(section_count):
+            section = copy.deepcopy(template[section_index % len(template)])
+            section["subject"], section["catalog_number"] = "SYN", catalog_number
+            section["section"] = "{} {:03}".format(section["section"][:3], section_index + 1)
+            section["class_number"] = course_index * 1000 + section_index
+            shift = rng.randint(-3, 3)
+            for class_entry in section["classes"]:
+                date = class_entry["date"]
+                if date["start_time"] is None or date["end_time"] is None: continue
+                start_hour, end_hour = int(date["start_time"][:2]) + shift, int(date["end_time"][:2]) + shift
+                if 7 <= start_hour and end_hour <= 22:
+                    date["start_time"], date["end_time"] = "{:02}{}".format(start_hour, date["start_time"][2:]), "{:02}{}".format(end_hour, date["end_time"][2:])
+            sections.append(section)
+        result["SYN" + catalog_number] = sections
+    return result
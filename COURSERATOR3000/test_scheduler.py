@@ -0,0 +1,168 @@
+import copy
+import itertools
+import random
+import unittest
+from datetime import datetime
+
+try:  # when used as a module, do relative import
+    from . import course_info
+    from . import scheduler
+    from . import test_data
+except SystemError:  # not being used as a module, do normal import
+    import course_info
+    import scheduler
+    import test_data
+
+TERM_START, TERM_END = datetime(2015, 1, 5), datetime(2015, 4, 6) # lecture dates of the term in `test_data`
+
+def make_section(course, section, start_time, end_time, weekdays, start_date=None, end_date=None):
+    """Returns schedule data for a section with one class, in the same format as the sections in `test_data.courses_data`."""
+    result = copy.deepcopy(test_data.courses_data["CS240"][0])
+    result["subject"], result["catalog_number"], result["section"] = course[:-3], course[-3:], section
+    result["classes"] = [{"date": {"start_time": start_time, "end_time": end_time, "weekdays": weekdays, "start_date": start_date, "end_date": end_date, "is_tba": False, "is_cancelled": False, "is_closed": False}, "location": {"building": None, "room": None}, "instructors": []}]
+    return result
+
+def get_edge_case_courses_data():
+    """Returns schedule data for courses with sections that only meet for part of the term, or that can't be represented as weekly meeting patterns."""
+    return {
+        "EDGE101": [
+            make_section("EDGE101", "LEC 001", "13:00", "14:20", "TTh", "02/02", "03/13"), # overlaps CS240 LEC 001 for only part of the term
+            make_section("EDGE101", "LEC 002", "22:00", "24:30", "M"), # runs past midnight, so it falls back to comparing blocks
+            make_section("EDGE101", "LEC 003", "08:30", "09:20", "F", "04/03", "04/03"), # meets once
+        ],
+        "EDGE102": [
+            make_section("EDGE102", "LEC 001", "00:00", "01:00", "T"), # conflicts with the meetings of EDGE101 LEC 002 that continue past midnight
+            make_section("EDGE102", "LEC 002", "13:00", "14:20", "TTh", "03/16", "04/06"), # overlaps EDGE101 LEC 001 on weekdays and times, but not dates
+            make_section("EDGE102", "LEC 003", "08:30", "09:20", "F", "03/27", "04/10"), # overlaps EDGE101 LEC 003 on a single day
+        ],
+    }
+
+def get_block_conflicts(requirements, course_sections, courses=None):
+    """Returns the set of pairs of conflicting sections from different requirements, found by comparing the blocks of every pair of sections."""
+    sections = [(requirement, (requirement[0], section)) for requirement, section_names in requirements.items() for section in section_names]
+    return {
+        frozenset((section1, section2))
+        for (requirement1, section1), (requirement2, section2) in itertools.combinations(sections, 2)
+        if requirement1 != requirement2 and (courses is None or section1[0] in courses or section2[0] in courses)
+        and scheduler.check_section_conflict(course_sections[section1], course_sections[section2])
+    }
+
+def get_valid_schedules(requirements, conflicts):
+    """Returns the set of schedules (as frozensets of sections) with one section from each requirement in `requirements` and no pair of sections in `conflicts`, found by checking every combination of sections."""
+    return {
+        frozenset(schedule)
+        for schedule in itertools.product(*requirements)
+        if not any(frozenset(pair) in conflicts for pair in itertools.combinations(schedule, 2))
+    }
+
+def build_scheduler(requirements, conflicts, equivalent_sections, encoding, symmetry_breaking):
+    """Returns a `Scheduler` using the encoding `encoding` for the given requirements (lists of sections) and conflicts, marking the groups of sections in `equivalent_sections` as interchangeable if `symmetry_breaking` is True."""
+    s = scheduler.Scheduler(encoding)
+    for sections in requirements:
+        s.add_requirement(sections[0][0], [section[1] for section in sections])
+    for section1, section2 in conflicts:
+        s.add_conflict(section1, section2)
+    if symmetry_breaking:
+        for sections in equivalent_sections:
+            s.add_equivalent_sections(sections)
+    return s
+
+class TestConflicts(unittest.TestCase):
+    def setUp(self):
+        scheduler.conflicts_cache.clear()
+
+    def assertConflictsMatch(self, courses_data):
+        course_sections = course_info.get_courses_sections(courses_data, TERM_START, TERM_END)
+        requirements = scheduler.get_requirements(course_sections)
+        expected = get_block_conflicts(requirements, course_sections)
+        self.assertTrue(expected)
+
+        conflicts = list(scheduler.get_conflicts(requirements, course_sections))
+        self.assertEqual(len(conflicts), len(expected)) # no pair is produced twice
+        self.assertEqual({frozenset(pair) for pair in conflicts}, expected)
+
+        # only conflicts involving the given courses
+        courses = set(sorted(courses_data)[::2])
+        conflicts = list(scheduler.get_conflicts(requirements, course_sections, courses))
+        self.assertEqual({frozenset(pair) for pair in conflicts}, get_block_conflicts(requirements, course_sections, courses))
+
+        # cached conflicts, computed from scratch and then reused when a course is added
+        partial_requirements = {requirement: sections for requirement, sections in requirements.items() if requirement[0] != max(courses_data)}
+        conflicts = scheduler.get_cached_conflicts(partial_requirements, course_sections)
+        self.assertEqual({frozenset(pair) for pair in conflicts}, get_block_conflicts(partial_requirements, course_sections))
+        for _ in range(2):
+            conflicts = scheduler.get_cached_conflicts(requirements, course_sections)
+            self.assertEqual(len(conflicts), len(expected))
+            self.assertEqual({frozenset(pair) for pair in conflicts}, expected)
+
+    def test_recorded_courses(self):
+        self.assertConflictsMatch(test_data.courses_data)
+
+    def test_synthetic_courses(self):
+        self.assertConflictsMatch(test_data.get_synthetic_courses_data(8, 12))
+
+    def test_edge_cases(self):
+        courses_data = dict(test_data.courses_data, **get_edge_case_courses_data())
+        course_sections = course_info.get_courses_sections(courses_data, TERM_START, TERM_END)
+        self.assertIsNone(course_sections[("EDGE101", "LEC 002")].patterns)
+        self.assertConflictsMatch(courses_data)
+
+        # make sure each edge case actually comes up
+        requirements = scheduler.get_requirements(course_sections)
+        conflicts = {frozenset(pair) for pair in scheduler.get_conflicts(requirements, course_sections)}
+        self.assertIn(frozenset({("EDGE101", "LEC 001"), ("CS240", "LEC 001")}), conflicts)
+        self.assertIn(frozenset({("EDGE101", "LEC 002"), ("EDGE102", "LEC 001")}), conflicts)
+        self.assertIn(frozenset({("EDGE101", "LEC 003"), ("EDGE102", "LEC 003")}), conflicts)
+        self.assertNotIn(frozenset({("EDGE101", "LEC 001"), ("EDGE102", "LEC 002")}), conflicts)
+
+class TestSolve(unittest.TestCase):
+    def assertSolutionsMatch(self, requirements, conflicts, equivalent_sections):
+        expected = get_valid_schedules(requirements, {frozenset(pair) for pair in conflicts})
+        self.assertTrue(expected)
+        for encoding in scheduler.ENCODINGS:
+            for symmetry_breaking in (False, True):
+                with self.subTest(encoding=encoding, symmetry_breaking=symmetry_breaking):
+                    schedules = [frozenset(schedule) for schedule in build_scheduler(requirements, conflicts, equivalent_sections, encoding, symmetry_breaking).solve()]
+                    self.assertEqual(len(schedules), len(set(schedules))) # no schedule is produced twice
+                    self.assertEqual(set(schedules), expected)
+
+    def test_synthetic_constraints(self):
+        # requirements with more than four sections, so the sequential counter and commander encodings are actually used
+        rng = random.Random(0)
+        requirements = [[("COURSE{}".format(requirement), "LEC {:03}".format(section)) for section in range(section_count)] for requirement, section_count in enumerate((13, 9, 5, 1))]
+        slots = [sections[index:index + 3] for sections in requirements for index in range(0, len(sections), 3)] # groups of interchangeable sections
+        conflicts = [
+            (section1, section2)
+            for slot1, slot2 in itertools.combinations(slots, 2) if slot1[0][0] != slot2[0][0] and rng.random() < 0.2
+            for section1 in slot1 for section2 in slot2
+        ]
+        self.assertSolutionsMatch(requirements, conflicts, [slot for slot in slots if len(slot) > 1])
+
+    def test_synthetic_courses(self):
+        course_sections = course_info.get_courses_sections(test_data.get_synthetic_courses_data(3, 15), TERM_START, TERM_END)
+        requirements = scheduler.get_requirements(course_sections)
+        conflicts = list(scheduler.get_conflicts(requirements, course_sections))
+        equivalent_sections = scheduler.collapse_equivalent_sections(requirements, course_sections)[1]
+        self.assertTrue(equivalent_sections)
+        self.assertSolutionsMatch([[(requirement[0], section) for section in sections] for requirement, sections in requirements.items()], conflicts, equivalent_sections)
+
+    def test_build_scheduler(self):
+        course_sections = course_info.get_courses_sections(test_data.courses_data, TERM_START, TERM_END)
+        schedules = [frozenset(schedule) for schedule in scheduler.build_scheduler(course_sections, collapse_equivalent=False).solve()]
+        collapsed_schedules = [frozenset(schedule) for schedule in scheduler.build_scheduler(course_sections, collapse_equivalent=True).solve()]
+        self.assertEqual(len(collapsed_schedules), len(set(collapsed_schedules)))
+        self.assertEqual(set(collapsed_schedules), set(schedules))
+
+    def test_distinct_timetables_first(self):
+        # schedules that only differ in interchangeable sections come after every schedule with different meeting times, so that pages aren't filled with copies of one timetable
+        course_sections = course_info.get_courses_sections(test_data.get_synthetic_courses_data(3, 15), TERM_START, TERM_END)
+        timetables = [
+            frozenset((section[0], section[1][:3], tuple(course_sections[section].starts), tuple(course_sections[section].ends)) for section in schedule)
+            for schedule in scheduler.build_scheduler(course_sections).solve()
+        ]
+        distinct_count = len(set(timetables))
+        self.assertLess(distinct_count, len(timetables))
+        self.assertEqual(len(set(timetables[:distinct_count])), distinct_count)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+
+try:  # when used as a module, do relative import
+    from . import uwapi
+    from .cache import SQLiteCache
+except SystemError:  # not being used as a module, do normal import
+    import uwapi
+    from cache import SQLiteCache
+
+class TestRefresh(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.original_cache, self.original_fetch = uwapi.cache, uwapi.fetch
+        uwapi.cache = SQLiteCache(os.path.join(self.directory.name, "uwapi.sqlite3"))
+        self.fetches = []
+        def fetch(endpoint, params):
+            time.sleep(0.2) # slow enough for requests to pile up while it's running
+            self.fetches.append(endpoint)
+            return {"fetch": len(self.fetches)}
+        uwapi.fetch = fetch
+
+    def tearDown(self):
+        uwapi.cache, uwapi.fetch = self.original_cache, self.original_fetch
+        self.directory.cleanup()
+
+    def test_concurrent_stale_hits(self):
+        key = uwapi.cache_key("terms/list", {})
+        uwapi.cache.set(key, {"fetch": 0}, time.time() - uwapi.UW_API_FRESH_TIME - 1)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(uwapi.uwapi("terms/list"))) for _ in range(50)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        self.assertEqual(results, [{"fetch": 0}] * 50) # stale hits return the stale value right away
+
+        # wait for the background refresh, and for any other refreshes that would have been submitted
+        deadline = time.time() + 5
+        while uwapi.cache.get(key)[0] == {"fetch": 0} and time.time() < deadline: time.sleep(0.05)
+        time.sleep(0.5)
+        self.assertEqual(self.fetches, ["terms/list"])
+        self.assertEqual(uwapi.uwapi("terms/list"), {"fetch": 1})
+        self.assertFalse(uwapi.refreshing)
+
+    def test_update_after_other_update(self):
+        key = uwapi.cache_key("terms/list", {})
+        uwapi.cache.set(key, {"fetch": 0}, time.time()) # updated by another process just before the lease is acquired
+        self.assertEqual(uwapi.update(key, "terms/list", {}, False), {"fetch": 0})
+        self.assertEqual(self.fetches, [])
+        self.assertTrue(uwapi.cache.acquire_refresh(key, 1)) # the lease was released
+
+if __name__ == "__main__":
+    unittest.main()
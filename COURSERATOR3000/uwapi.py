@@ -1,18 +1,125 @@
 #!/usr/bin/env python3
 
+import os
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
 UW_API_KEY = "123afda14d0a233ecb585591a95e0339"
-UW_API_BASE = "http://api.uwaterloo.ca/v2/"
+UW_API_BASE = os.environ.get("UW_API_BASE", "http://api.uwaterloo.ca/v2/") # can be pointed at a local stand-in server for testing
+UW_API_TIMEOUT = 10 # seconds to wait for the API to respond before giving up on a request
+UW_API_MAX_CONNECTIONS = 16 # maximum number of keep-alive connections to the API
+UW_API_CACHE = os.environ.get("UW_API_CACHE", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instance", "uwapi.sqlite3")) # cache database shared by every process (by default in the app's instance folder, where other users can't plant data like they could in a shared temporary directory), or an empty string to only cache in memory
+UW_API_FRESH_TIME = 60 * 60 * 24 # seconds before a cached response is refreshed in the background
 
-import cachetools
 import requests
 
-@cachetools.cached(cachetools.TTLCache(maxsize=500, ttl=60 * 60 * 24)) # max 500 items, expire after a day
-def uwapi(endpoint, **params):
-    params["key"] = UW_API_KEY
-    r = requests.get(UW_API_BASE + endpoint + ".json", params=params)
-    assert r.status_code == 200, "HTTP error {}".format(r.status_code)
-    value = r.json()
+try:
+    from .cache import MemoryCache, SQLiteCache # relative import
+    from . import metrics
+except SystemError: # not being used as a module
+    from cache import MemoryCache, SQLiteCache # normal import
+    import metrics
+
+# shared session, so that connections to the API are kept alive and reused between requests and threads
+session = requests.Session()
+session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=UW_API_MAX_CONNECTIONS))
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=UW_API_MAX_CONNECTIONS))
+
+if UW_API_CACHE: os.makedirs(os.path.dirname(os.path.abspath(UW_API_CACHE)), exist_ok=True)
+cache = SQLiteCache(UW_API_CACHE) if UW_API_CACHE else MemoryCache()
+refresher = ThreadPoolExecutor(max_workers=4) # refreshes stale cache entries in the background
+in_flight = {} # mapping from cache keys to futures for API requests currently being made by this process
+refreshing = set() # cache keys with a background refresh submitted by this process that hasn't finished yet
+in_flight_lock = threading.Lock()
+
+def fetch(endpoint, params):
+    params = dict(params, key=UW_API_KEY)
+    start, result = time.perf_counter(), "error"
+    try:
+        r = session.get(UW_API_BASE + endpoint + ".json", params=params, timeout=UW_API_TIMEOUT)
+        assert r.status_code == 200, "HTTP error {}".format(r.status_code)
+        value = r.json()
+        result = "ok"
+    finally:
+        metrics.observe("courserator_uwapi_fetch_seconds", time.perf_counter() - start, result=result)
     return value["data"]
 
+def update(key, endpoint, params, wait):
+    """
+    Fetches the value for `key` from the API and stores it in the cache, returning the new value.
+
+    If another process is already updating the same key, this waits for that update if `wait` is True, and otherwise returns None immediately. If the other process's update fails or its refresh lease expires while waiting, this updates the value itself, unless the value turns out to be fresh by then.
+    """
+    deadline = time.time() + UW_API_TIMEOUT * 4 # long enough for the other process's refresh lease to expire
+    while not cache.acquire_refresh(key, UW_API_TIMEOUT * 2):
+        if not wait: return None
+        if time.time() >= deadline: raise TimeoutError("timed out waiting for another process to fetch {}".format(endpoint))
+        time.sleep(0.05) # wait for the other process to finish updating the value
+        entry = cache.get(key)
+        if entry is not None and time.time() - entry[1] <= UW_API_FRESH_TIME: return entry[0]
+    try: # only reached while holding the refresh lease, so it's never released while another process holds it
+        entry = cache.get(key)
+        if entry is not None and time.time() - entry[1] <= UW_API_FRESH_TIME: return entry[0] # another update finished just before the lease was acquired
+        value = fetch(endpoint, params)
+        cache.set(key, value, time.time())
+        return value
+    finally:
+        cache.release_refresh(key)
+
+def single_flight(key, function):
+    """Calls `function` and returns its result, unless it is already being called for the same `key` in this process, in which case the result of that call is returned instead."""
+    with in_flight_lock:
+        future = in_flight.get(key)
+        is_owner = future is None
+        if is_owner: future = in_flight[key] = Future()
+    if not is_owner: return future.result()
+    try:
+        result = function()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with in_flight_lock: del in_flight[key]
+
+def refresh(key, endpoint, params):
+    """Updates the value for `key` in the background (see `update`), for a refresh submitted by `uwapi`."""
+    try:
+        update(key, endpoint, params, False)
+    finally:
+        with in_flight_lock: refreshing.discard(key)
+
+def cache_key(endpoint, params):
+    return json.dumps([endpoint, params], sort_keys=True)
+
+def uwapi(endpoint, **params):
+    """
+    Returns the data for the API endpoint `endpoint`, called with the parameters `params`.
+
+    Responses are cached in `cache`. Once a cached response is more than `UW_API_FRESH_TIME` seconds old, the stale response is still returned immediately, while a fresh one is fetched in the background.
+    """
+    key = cache_key(endpoint, params)
+    entry = cache.get(key)
+    if entry is None: # never fetched before, so we have to wait for it
+        metrics.increment("courserator_uwapi_requests_total", result="miss")
+        return single_flight(key, lambda: update(key, endpoint, params, True))
+    value, updated = entry
+    if time.time() - updated > UW_API_FRESH_TIME: # stale, refresh it in the background
+        metrics.increment("courserator_uwapi_requests_total", result="stale")
+        with in_flight_lock:
+            is_refreshing = key in refreshing
+            refreshing.add(key)
+        if not is_refreshing: refresher.submit(refresh, key, endpoint, params) # only one refresh per key at a time, rather than one for every request while the first is still running
+    else:
+        metrics.increment("courserator_uwapi_requests_total", result="hit")
+    return value
+
+def uwapi_updated(endpoint, **params):
+    """Returns the time the cached data for the API endpoint `endpoint` called with the parameters `params` was last updated (in seconds since the epoch), or None if it isn't cached."""
+    return cache.updated(cache_key(endpoint, params))
+
 if __name__ == "__main__":
-    print(uwapi("terms/list"))
\ No newline at end of file
+    print(uwapi("terms/list"))